@@ -1,23 +1,51 @@
 from fastapi import FastAPI, HTTPException, Depends, Header, Security, WebSocket, WebSocketDisconnect
+from fastapi.responses import ORJSONResponse
 from fastapi.security.api_key import APIKeyHeader, APIKey
 from pydantic import BaseModel
 from typing import Dict, Any, List, Optional
+import asyncio
+import logging
 import secrets
-import json
+import signal
+import sys
+import orjson
+import zstandard
 import os
+import functools
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
 from services.crunchbase_service import CrunchbaseService
-from services.research_service import ResearchService
+from services.batched_sender import BatchedSender
+
+@functools.lru_cache(maxsize=1)
+def get_research_service():
+    """
+    Import ResearchService on first use.
+
+    The research service pulls in the agents SDK, OpenAI client and all agent
+    definitions, so deferring it keeps startup and reloads fast.
+    """
+    from services.research_service import ResearchService
+    return ResearchService
+
+# Result frames larger than this are zstd-compressed for clients that ask for it
+WS_COMPRESS_MIN_BYTES = 4096
+ZSTD_MAGIC = b"ZSTD"
+_zstd_compressor = zstandard.ZstdCompressor(level=3)
 
 # API Key configuration
-# In a production environment, this should be stored securely (e.g., environment variables)
-API_KEY = "your-secret-api-key-12345"
+# Read once at startup; the default is only meant for local development
+API_KEY = os.getenv("API_KEY", "your-secret-api-key-12345")
 API_KEY_NAME = "X-API-Key"
 
+def is_valid_api_key(api_key: Optional[str]) -> bool:
+    """Compare an API key against the configured key in constant time"""
+    return isinstance(api_key, str) and secrets.compare_digest(api_key, API_KEY)
+
 # API Key security scheme
 api_key_header = APIKeyHeader(name=API_KEY_NAME, auto_error=False)
 
@@ -29,7 +57,7 @@ async def get_api_key(api_key: str = Security(api_key_header)):
             detail="API Key is missing",
             headers={"WWW-Authenticate": "ApiKey"},
         )
-    if api_key != API_KEY:
+    if not is_valid_api_key(api_key):
         raise HTTPException(
             status_code=403,
             detail="Invalid API Key",
@@ -37,11 +65,60 @@ async def get_api_key(api_key: str = Security(api_key_header)):
         )
     return api_key
 
+logger = logging.getLogger(__name__)
+
+def reload_openai_key() -> None:
+    """Re-read .env and switch the OpenAI client to the current OPENAI_API_KEY"""
+    load_dotenv(override=True)
+    # Before the research service is loaded there is no client yet; it reads
+    # the key when it is created
+    client_module = sys.modules.get("vc_agents.client")
+    if client_module is None:
+        return
+    try:
+        client_module.reload_openai_client()
+        logger.info("Reloaded the OpenAI client")
+    except Exception:
+        logger.exception("Failed to reload the OpenAI client; keeping the current one")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Install the key rotation signal handler and release shared resources when the server shuts down"""
+    # `kill -HUP <pid>` rotates the OpenAI key without a restart. Windows has no
+    # SIGHUP, and loops outside the main thread (e.g. TestClient) cannot add handlers
+    loop = asyncio.get_running_loop()
+    sighup_installed = False
+    if hasattr(signal, "SIGHUP"):
+        try:
+            loop.add_signal_handler(signal.SIGHUP, reload_openai_key)
+            sighup_installed = True
+        except (NotImplementedError, RuntimeError, ValueError):
+            logger.warning("Could not install the SIGHUP handler; OpenAI key rotation needs a restart")
+    yield
+    if sighup_installed:
+        loop.remove_signal_handler(signal.SIGHUP)
+    from services.scraping_service import ScrapingService
+    from services.search_service import SearchService
+    await ScrapingService.close()
+    await SearchService.close()
+    
+    # The OpenAI client only exists once the research service has been loaded
+    client_module = sys.modules.get("vc_agents.client")
+    if client_module is not None:
+        await client_module.close_openai_client()
+    
+    # Likewise, pooled sandboxes only exist once the agent tools have been loaded
+    tools_module = sys.modules.get("vc_agents.tools")
+    if tools_module is not None:
+        await tools_module.close_sandbox_pool()
+
 # Initialize FastAPI app
 app = FastAPI(
     title="VC Research Engine",
     description="API for retrieving and researching startup data",
-    version="0.1.0"
+    version="0.1.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Sample response model for getData endpoint
@@ -85,7 +162,7 @@ async def research(request: ResearchRequest, api_key: APIKey = Depends(get_api_k
     This is currently a placeholder for future implementation
     """
     try:
-        result = await ResearchService.perform_research(request.company_name, request.params)
+        result = await get_research_service().perform_research(request.company_name, request.params)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error performing research: {str(e)}")
@@ -99,14 +176,14 @@ async def websocket_research(websocket: WebSocket):
     try:
         # Wait for the initial message with company name and API key
         data = await websocket.receive_text()
-        request_data = json.loads(data)
+        request_data = orjson.loads(data)
         
         # Validate API key
-        if request_data.get("api_key") != API_KEY:
-            await websocket.send_text(json.dumps({
+        if not is_valid_api_key(request_data.get("api_key")):
+            await websocket.send_text(orjson.dumps({
                 "type": "error",
                 "message": "Invalid API Key"
-            }))
+            }).decode())
             await websocket.close()
             return
         
@@ -114,33 +191,39 @@ async def websocket_research(websocket: WebSocket):
         params = request_data.get("params", {})
         
         if not company_name:
-            await websocket.send_text(json.dumps({
+            await websocket.send_text(orjson.dumps({
                 "type": "error",
                 "message": "Company name is required"
-            }))
+            }).decode())
             await websocket.close()
             return
         
-        # Perform research with streaming updates
-        result = await ResearchService.perform_research(
-            company_name=company_name,
-            research_params=params,
-            websocket=websocket
-        )
+        # Progress updates are coalesced into batch frames
+        async with BatchedSender(websocket) as sender:
+            # Perform research with streaming updates
+            result = await get_research_service().perform_research(
+                company_name=company_name,
+                research_params=params,
+                websocket=sender
+            )
         
-        # Send the final result
-        await websocket.send_text(json.dumps({
+        # Send the final result, compressed if the client supports it
+        payload = orjson.dumps({
             "type": "result",
             "data": result
-        }))
+        })
+        if request_data.get("compression") == "zstd" and len(payload) > WS_COMPRESS_MIN_BYTES:
+            await websocket.send_bytes(ZSTD_MAGIC + _zstd_compressor.compress(payload))
+        else:
+            await websocket.send_text(payload.decode())
         
     except WebSocketDisconnect:
         pass
     except Exception as e:
-        await websocket.send_text(json.dumps({
+        await websocket.send_text(orjson.dumps({
             "type": "error",
             "message": f"Error: {str(e)}"
-        }))
+        }).decode())
         await websocket.close()
 
 # Root endpoint for API health check (no authentication required)
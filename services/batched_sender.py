@@ -0,0 +1,102 @@
+import asyncio
+import os
+from typing import List, Optional
+from fastapi import WebSocket
+
+# Batching knobs, tunable per deployment
+WS_BATCH_INTERVAL = float(os.getenv("WS_BATCH_INTERVAL_MS", "50")) / 1000
+WS_MIN_BATCH_SIZE = int(os.getenv("WS_MIN_BATCH_SIZE", "4"))
+WS_MAX_BATCH_SIZE = int(os.getenv("WS_MAX_BATCH_SIZE", "64"))
+WS_BATCH_GROWTH_FACTOR = float(os.getenv("WS_BATCH_GROWTH_FACTOR", "2.0"))
+
+class BatchedSender:
+    """
+    Coalesces outgoing WebSocket text frames into batch frames.
+
+    Messages passed to send_text are queued and a drain task flushes them
+    every WS_BATCH_INTERVAL seconds or once the current batch size is reached.
+    A flush of several messages is sent as {"type": "batch", "items": [...]};
+    a single pending message is sent as-is. The batch size starts at
+    min_batch_size and grows by growth_factor (up to max_batch_size) while
+    batches keep filling up, and drops back once traffic slows down.
+
+    Use as an async context manager so pending messages are flushed on exit.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        flush_interval: float = WS_BATCH_INTERVAL,
+        min_batch_size: int = WS_MIN_BATCH_SIZE,
+        max_batch_size: int = WS_MAX_BATCH_SIZE,
+        growth_factor: float = WS_BATCH_GROWTH_FACTOR
+    ):
+        self.websocket = websocket
+        self.flush_interval = flush_interval
+        self.min_batch_size = max(1, min_batch_size)
+        self.max_batch_size = max(self.min_batch_size, max_batch_size)
+        self.growth_factor = growth_factor
+        self._batch_size = self.min_batch_size
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> "BatchedSender":
+        self._task = asyncio.create_task(self._drain())
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def send_text(self, data: str) -> None:
+        """Queue a JSON text message for the next batch"""
+        self._queue.put_nowait(data)
+
+    async def close(self) -> None:
+        """Flush any pending messages and stop the drain task"""
+        if self._task is None:
+            return
+        self._queue.put_nowait(None)
+        task, self._task = self._task, None
+        await task
+
+    async def _drain(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            message = await self._queue.get()
+            if message is None:
+                return
+
+            batch = [message]
+            closing = False
+            deadline = loop.time() + self.flush_interval
+
+            # Collect until the batch is full or the interval elapses
+            while len(batch) < self._batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    message = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if message is None:
+                    closing = True
+                    break
+                batch.append(message)
+
+            # Grow the batch size under sustained load, reset when it eases
+            if len(batch) >= self._batch_size:
+                self._batch_size = min(self.max_batch_size, max(self._batch_size + 1, int(self._batch_size * self.growth_factor)))
+            else:
+                self._batch_size = self.min_batch_size
+
+            await self._send(batch)
+            if closing:
+                return
+
+    async def _send(self, batch: List[str]) -> None:
+        if len(batch) == 1:
+            await self.websocket.send_text(batch[0])
+        else:
+            # Items are already serialized JSON, so splice them in directly
+            await self.websocket.send_text('{"type":"batch","items":[' + ",".join(batch) + "]}")
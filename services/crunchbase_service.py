@@ -1,5 +1,66 @@
+from types import MappingProxyType
 from typing import Dict, Any
 
+def _openai_data() -> Dict[str, Any]:
+    """Build the mock entry for OpenAI"""
+    return {
+        "name": "OpenAI",
+        "description": "OpenAI is an AI research and deployment company dedicated to ensuring that artificial general intelligence benefits all of humanity.",
+        "funding_rounds": [
+            {"date": "2019-03-01", "amount": 1000000000, "series": "A", "investors": ["Microsoft"]},
+            {"date": "2021-01-15", "amount": 2000000000, "series": "B", "investors": ["Khosla Ventures", "Reid Hoffman"]}
+        ],
+        "founders": ["Sam Altman", "Elon Musk", "Greg Brockman", "Ilya Sutskever", "John Schulman", "Wojciech Zaremba"],
+        "industry": "Artificial Intelligence",
+        "founded_year": 2015,
+        "total_funding": 3000000000,
+        "website": "https://openai.com",
+        "location": "San Francisco, CA",
+        "status": "Operating"
+    }
+
+def _anthropic_data() -> Dict[str, Any]:
+    """Build the mock entry for Anthropic"""
+    return {
+        "name": "Anthropic",
+        "description": "Anthropic is an AI safety company working to build reliable, interpretable, and steerable AI systems.",
+        "funding_rounds": [
+            {"date": "2021-05-01", "amount": 124000000, "series": "A", "investors": ["Jaan Tallinn", "Dustin Moskovitz"]},
+            {"date": "2022-04-15", "amount": 580000000, "series": "B", "investors": ["Google", "Spark Capital"]}
+        ],
+        "founders": ["Dario Amodei", "Daniela Amodei", "Tom Brown"],
+        "industry": "Artificial Intelligence",
+        "founded_year": 2021,
+        "total_funding": 704000000,
+        "website": "https://www.anthropic.com",
+        "location": "San Francisco, CA",
+        "status": "Operating"
+    }
+
+# Mock data for demonstration: a factory per known company, so each call gets
+# fresh dicts and lists that callers can change without affecting later requests
+_MOCK_DATA = MappingProxyType({
+    "openai": _openai_data,
+    "anthropic": _anthropic_data
+})
+
+def _default_startup_data(company_name: str, key: str) -> Dict[str, Any]:
+    """Build the default mock entry for a company not in the mock data"""
+    return {
+        "name": company_name,
+        "description": f"Mock data for {company_name}",
+        "funding_rounds": [
+            {"date": "2022-01-01", "amount": 5000000, "series": "Seed", "investors": ["Mock Ventures"]}
+        ],
+        "founders": ["Founder 1", "Founder 2"],
+        "industry": "Technology",
+        "founded_year": 2020,
+        "total_funding": 5000000,
+        "website": f"https://www.{key}.com",
+        "location": "San Francisco, CA",
+        "status": "Operating"
+    }
+
 class CrunchbaseService:
     """
     Service for interacting with Crunchbase data
@@ -17,56 +78,11 @@ class CrunchbaseService:
         Returns:
             Dictionary containing startup data
         """
-        # Mock data for demonstration
-        mock_data = {
-            "openai": {
-                "name": "OpenAI",
-                "description": "OpenAI is an AI research and deployment company dedicated to ensuring that artificial general intelligence benefits all of humanity.",
-                "funding_rounds": [
-                    {"date": "2019-03-01", "amount": 1000000000, "series": "A", "investors": ["Microsoft"]},
-                    {"date": "2021-01-15", "amount": 2000000000, "series": "B", "investors": ["Khosla Ventures", "Reid Hoffman"]}
-                ],
-                "founders": ["Sam Altman", "Elon Musk", "Greg Brockman", "Ilya Sutskever", "John Schulman", "Wojciech Zaremba"],
-                "industry": "Artificial Intelligence",
-                "founded_year": 2015,
-                "total_funding": 3000000000,
-                "website": "https://openai.com",
-                "location": "San Francisco, CA",
-                "status": "Operating"
-            },
-            "anthropic": {
-                "name": "Anthropic",
-                "description": "Anthropic is an AI safety company working to build reliable, interpretable, and steerable AI systems.",
-                "funding_rounds": [
-                    {"date": "2021-05-01", "amount": 124000000, "series": "A", "investors": ["Jaan Tallinn", "Dustin Moskovitz"]},
-                    {"date": "2022-04-15", "amount": 580000000, "series": "B", "investors": ["Google", "Spark Capital"]}
-                ],
-                "founders": ["Dario Amodei", "Daniela Amodei", "Tom Brown"],
-                "industry": "Artificial Intelligence",
-                "founded_year": 2021,
-                "total_funding": 704000000,
-                "website": "https://www.anthropic.com",
-                "location": "San Francisco, CA",
-                "status": "Operating"
-            }
-        }
+        key = company_name.lower()
+        
+        build = _MOCK_DATA.get(key)
+        if build is not None:
+            return build()
         
-        # Check if the requested company exists in our mock data
-        if company_name.lower() in mock_data:
-            return mock_data[company_name.lower()]
-        else:
-            # Return a default mock entry if company not found
-            return {
-                "name": company_name,
-                "description": f"Mock data for {company_name}",
-                "funding_rounds": [
-                    {"date": "2022-01-01", "amount": 5000000, "series": "Seed", "investors": ["Mock Ventures"]}
-                ],
-                "founders": ["Founder 1", "Founder 2"],
-                "industry": "Technology",
-                "founded_year": 2020,
-                "total_funding": 5000000,
-                "website": f"https://www.{company_name.lower()}.com",
-                "location": "San Francisco, CA",
-                "status": "Operating"
-            }
+        # Fall back to a default mock entry if company not found
+        return _default_startup_data(company_name, key)
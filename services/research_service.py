@@ -1,15 +1,19 @@
 from typing import Dict, Any, List, Optional, Union
 import os
-import json
+import orjson
 import asyncio
-import jsonschema
-from pydantic import BaseModel
+import functools
+import fastjsonschema
+from dataclasses import dataclass, asdict, fields
 from fastapi import WebSocket
 
 # Import from our local modules
-from vc_agents.orchestrator import ResearchOrchestrator
+from vc_agents.orchestrator import ResearchOrchestrator, RESEARCH_SECTIONS
 from vc_agents.prompts import RESEARCH_OUTPUT_SCHEMA
 
+# Compile the schema once into a specialized validator function
+_validate = fastjsonschema.compile(RESEARCH_OUTPUT_SCHEMA)
+
 def validate_research_output(data: Dict[str, Any]) -> Dict[str, Union[bool, str]]:
     """
     Validate the research output against the expected schema
@@ -21,16 +25,76 @@ def validate_research_output(data: Dict[str, Any]) -> Dict[str, Union[bool, str]
         Dictionary with validation result and error message if any
     """
     try:
-        jsonschema.validate(instance=data, schema=RESEARCH_OUTPUT_SCHEMA)
+        _validate(data)
         return {"valid": True, "message": ""}
-    except jsonschema.exceptions.ValidationError as e:
+    except fastjsonschema.JsonSchemaException as e:
         return {"valid": False, "message": str(e)}
     except Exception as e:
         return {"valid": False, "message": f"Unexpected validation error: {str(e)}"}
 
-class ResearchParams(BaseModel):
+# Research phases announced before the orchestrator runs, serialized once
+_RESEARCH_PHASES = ("Initializing research orchestrator",) + tuple(
+    phase for *_, phase in RESEARCH_SECTIONS
+)
+_PHASE_BATCH_MESSAGE = orjson.dumps({
+    "type": "phase_batch",
+    "messages": [{"type": "phase", "message": phase} for phase in _RESEARCH_PHASES]
+}).decode()
+
+async def _forward_progress(progress: asyncio.Queue, websocket: WebSocket) -> None:
+    """
+    Send queued messages to the websocket until a None sentinel arrives
+
+    Messages are either pre-serialized strings or dicts serialized here, so
+    producers never wait on the socket. Coalescing into batch frames is left
+    to the websocket wrapper (see BatchedSender).
+    """
+    while True:
+        message = await progress.get()
+        if message is None:
+            return
+        await websocket.send_text(message if isinstance(message, str) else orjson.dumps(message).decode())
+
+@dataclass(slots=True)
+class ResearchParams:
     depth: Optional[str] = "standard"  # standard, detailed
     focus_areas: Optional[List[str]] = None
+    single_call: bool = False  # research every section in one agent run
+
+# Unknown request parameters are ignored, as they were with the Pydantic model
+_RESEARCH_PARAM_FIELDS = frozenset(field.name for field in fields(ResearchParams))
+
+_TRUE_STRINGS = frozenset({"true", "1", "yes", "on"})
+_FALSE_STRINGS = frozenset({"false", "0", "no", "off"})
+
+def _parse_flag(value: Any) -> Optional[bool]:
+    """Read a boolean request flag, accepting real bools and "true"/"false"-style strings; None otherwise"""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        value = value.strip().lower()
+        if value in _TRUE_STRINGS:
+            return True
+        if value in _FALSE_STRINGS:
+            return False
+    return None
+
+def _research_params(research_params: Optional[Dict[str, Any]]) -> ResearchParams:
+    """Build ResearchParams from request parameters, ignoring unknown keys and unreadable flags"""
+    params = {
+        key: value for key, value in (research_params or {}).items()
+        if key in _RESEARCH_PARAM_FIELDS
+    }
+    if "single_call" in params:
+        single_call = _parse_flag(params.pop("single_call"))
+        if single_call is not None:
+            params["single_call"] = single_call
+    return ResearchParams(**params)
+
+@functools.lru_cache(maxsize=1)
+def get_orchestrator() -> ResearchOrchestrator:
+    """Return the process-wide research orchestrator, created on first use"""
+    return ResearchOrchestrator(model="gpt-4o")
 
 class ResearchService:
     """
@@ -54,67 +118,38 @@ class ResearchService:
         Returns:
             Dictionary containing research results
         """
-        params = ResearchParams(**(research_params or {}))
+        params = _research_params(research_params)
         
-        # Create the research orchestrator
-        orchestrator = ResearchOrchestrator(model="gpt-4o")
+        # The orchestrator holds no per-request state, so one instance is shared
+        orchestrator = get_orchestrator()
+        research = orchestrator.research_startup_single_call if params.single_call else orchestrator.research_startup
         
         # If websocket is provided, we need to implement streaming
         if websocket:
-            await websocket.send_text(json.dumps({
+            # All messages go through one queue drained by a separate task,
+            # so the research starts without waiting on any socket send
+            progress = asyncio.Queue()
+            forwarder = asyncio.create_task(_forward_progress(progress, websocket))
+            progress.put_nowait({
                 "type": "start",
                 "message": f"Starting research on {company_name}..."
-            }))
-            
-            # Send initial phase message
-            await websocket.send_text(json.dumps({
-                "type": "phase",
-                "message": "Initializing research orchestrator"
-            }))
-            
-            # TODO: Implement streaming with the orchestrator
-            # For now, we'll just run the research and send periodic updates
-            
-            # Send company overview phase message
-            await websocket.send_text(json.dumps({
-                "type": "phase",
-                "message": "Researching company overview"
-            }))
-            
-            # Send key people phase message
-            await websocket.send_text(json.dumps({
-                "type": "phase",
-                "message": "Analyzing key people"
-            }))
-            
-            # Send market analysis phase message
-            await websocket.send_text(json.dumps({
-                "type": "phase",
-                "message": "Analyzing market size (TAM/SAM)"
-            }))
-            
-            # Send competitor analysis phase message
-            await websocket.send_text(json.dumps({
-                "type": "phase",
-                "message": "Mapping competitive landscape"
-            }))
-            
-            # Send growth metrics phase message
-            await websocket.send_text(json.dumps({
-                "type": "phase",
-                "message": "Researching growth metrics and media presence"
-            }))
+            })
             
-            # Run the research
-            result = await orchestrator.research_startup(company_name, params.model_dump())
+            # Send all phase messages in a single frame
+            progress.put_nowait(_PHASE_BATCH_MESSAGE)
             
-            # Send completion message
-            await websocket.send_text(json.dumps({
-                "type": "complete",
-                "message": "Research complete!"
-            }))
+            # Stream section completions while the research runs
+            try:
+                result = await research(company_name, asdict(params), progress)
+                progress.put_nowait({
+                    "type": "complete",
+                    "message": "Research complete!"
+                })
+            finally:
+                progress.put_nowait(None)
+                await forwarder
             
             return result
         else:
             # Run the research without streaming
-            return await orchestrator.research_startup(company_name, params.model_dump())
+            return await research(company_name, asdict(params))
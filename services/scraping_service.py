@@ -1,5 +1,7 @@
-from playwright.async_api import async_playwright
-from typing import Dict, Any, Optional
+from playwright.async_api import async_playwright, Browser, BrowserContext, Playwright, Route
+from selectolax.lexbor import LexborHTMLParser
+from typing import Dict, Any, Optional, Tuple
+import asyncio
 import re
 import logging
 
@@ -7,6 +9,99 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Browser and context shared by all scrapes; each scrape gets its own page.
+# Chromium keeps a socket pool and DNS cache per context, so sharing one lets
+# pages on the same host reuse open connections instead of new TCP+TLS handshakes
+_playwright: Optional[Playwright] = None
+_browser: Optional[Browser] = None
+_context: Optional[BrowserContext] = None
+_browser_lock = asyncio.Lock()
+
+# Resource types scrapes never need, since only the DOM text is extracted;
+# aborting them lets domcontentloaded fire without waiting on the downloads.
+# Stylesheets still load: the selector texts come from innerText, which only
+# skips elements hidden by CSS (menus, modals) while the styles are applied.
+# Routing disables the browser's HTTP cache, which costs less than always
+# downloading every image and font on the page
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+
+async def _block_heavy_resources(route: Route) -> None:
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+async def _get_context() -> BrowserContext:
+    """Return the shared browser context, launching the browser on first use or after a crash"""
+    global _playwright, _browser, _context
+    async with _browser_lock:
+        if _browser is None or not _browser.is_connected():
+            if _playwright is None:
+                _playwright = await async_playwright().start()
+            logger.info("Launching shared Chromium browser")
+            _browser = await _playwright.chromium.launch(headless=True)
+            _context = None
+        if _context is None:
+            _context = await _browser.new_context()
+            await _context.route("**/*", _block_heavy_resources)
+        return _context
+
+# Collapses runs of whitespace in extracted text
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Characters of content returned per page; raw text is cut to a few times
+# this before cleanup so it still fills the limit after whitespace collapse
+MAX_CONTENT_CHARS = 5000
+_RAW_CONTENT_CHARS = MAX_CONTENT_CHARS * 4
+
+# Main content areas, in order of preference
+_CONTENT_SELECTORS = ("main", "article", ".content", "#content", ".main")
+
+# Returns the rendered HTML plus the inner text of every element matched by
+# each requested selector; a selector that fails yields an error string
+_SNAPSHOT_JS = """(selectors) => ({
+    html: document.documentElement.outerHTML,
+    selectors: Object.fromEntries(Object.entries(selectors).map(([key, selector]) => {
+        try {
+            return [key, Array.from(document.querySelectorAll(selector), (el) => el.innerText)];
+        } catch (e) {
+            return [key, `Error extracting ${key}: ${e.message}`];
+        }
+    }))
+})"""
+
+def _parse_page(html: str) -> Tuple[str, str, str]:
+    """
+    Extract the title, meta description and main text from page HTML
+    
+    Args:
+        html: Rendered page HTML
+        
+    Returns:
+        Tuple of (title, description, content)
+    """
+    tree = LexborHTMLParser(html)
+    
+    title_node = tree.css_first("title")
+    title = title_node.text(strip=True) if title_node else ""
+    
+    meta = tree.css_first('meta[name="description"]')
+    description = (meta.attributes.get("content") or "") if meta else ""
+    
+    # Remove script tags, style tags and embeds
+    tree.strip_tags(["script", "style", "noscript", "iframe"])
+    
+    # Get text from main content areas, falling back to the body
+    for selector in _CONTENT_SELECTORS:
+        node = tree.css_first(selector)
+        if node:
+            break
+    else:
+        node = tree.body
+    content = node.text(separator=" ", strip=True) if node else ""
+    
+    return title, description, content
+
 class ScrapingService:
     """Service for scraping websites using Playwright"""
     
@@ -25,97 +120,74 @@ class ScrapingService:
         logger.info(f"Scraping website: {url}")
         
         try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                page = await browser.new_page()
-                
-                try:
-                    logger.info(f"Navigating to {url}")
-                    # Increase timeout to 60 seconds and use domcontentloaded instead of networkidle
-                    # This helps with sites that have long-running scripts or many resources
-                    await page.goto(url, wait_until="domcontentloaded", timeout=60000)
-                    
-                    # Get page title
-                    title = await page.title()
-                    logger.info(f"Page title: {title}")
-                    
-                    # Get meta description
-                    description = await page.evaluate("""
-                        () => {
-                            const meta = document.querySelector('meta[name="description"]');
-                            return meta ? meta.getAttribute('content') : '';
-                        }
-                    """)
-                    
-                    # Get main content (simplified approach)
-                    content = await page.evaluate("""
-                        () => {
-                            // Remove script tags, style tags, and comments
-                            const bodyClone = document.body.cloneNode(true);
-                            const scripts = bodyClone.querySelectorAll('script, style, noscript, iframe');
-                            scripts.forEach(s => s.remove());
-                            
-                            // Get text from main content areas
-                            const contentSelectors = ['main', 'article', '.content', '#content', '.main'];
-                            for (const selector of contentSelectors) {
-                                const element = bodyClone.querySelector(selector);
-                                if (element) {
-                                    return element.innerText;
-                                }
-                            }
-                            
-                            // Fallback to body text
-                            return bodyClone.innerText;
-                        }
-                    """)
-                    
-                    # Clean up content
-                    content = re.sub(r'\s+', ' ', content).strip()
-                    logger.info(f"Extracted {len(content)} characters of content")
-                    
-                    # Extract specific content if selectors provided
-                    specific_content = {}
-                    if selectors:
-                        logger.info(f"Extracting specific content with selectors: {selectors}")
-                        for key, selector in selectors.items():
-                            try:
-                                elements = await page.query_selector_all(selector)
-                                if elements:
-                                    texts = []
-                                    for element in elements:
-                                        text = await element.inner_text()
-                                        if text.strip():
-                                            texts.append(text.strip())
-                                    specific_content[key] = texts
-                                    logger.info(f"Found {len(texts)} elements for selector '{key}'")
-                                else:
-                                    logger.warning(f"No elements found for selector '{key}'")
-                            except Exception as e:
-                                logger.error(f"Error extracting {key}: {str(e)}")
-                                specific_content[key] = f"Error extracting {key}: {str(e)}"
-                    
-                    result = {
-                        "url": url,
-                        "title": title,
-                        "description": description,
-                        "content": content[:5000],  # Limit content length
-                        "specific_content": specific_content
-                    }
-                    
-                    logger.info(f"Successfully scraped {url}")
-                    return result
-                    
-                except Exception as e:
-                    logger.exception(f"Error scraping {url}: {str(e)}")
-                    return {
-                        "url": url,
-                        "error": str(e)
-                    }
-                finally:
-                    await browser.close()
+            context = await _get_context()
+            page = await context.new_page()
         except Exception as e:
             logger.exception(f"Error initializing Playwright for {url}: {str(e)}")
             return {
                 "url": url,
                 "error": f"Failed to initialize scraper: {str(e)}"
             }
+        
+        try:
+            logger.info(f"Navigating to {url}")
+            # Increase timeout to 60 seconds and use domcontentloaded instead of networkidle
+            # This helps with sites that have long-running scripts or many resources
+            await page.goto(url, wait_until="domcontentloaded", timeout=60000)
+            
+            # Grab the rendered HTML and any selector texts in a single round trip
+            data = await page.evaluate(_SNAPSHOT_JS, selectors or {})
+            title, description, content = _parse_page(data["html"])
+            logger.info(f"Page title: {title}")
+            
+            # Clean up content, bounded so huge pages don't cost extra work
+            content = _WHITESPACE_RE.sub(' ', content[:_RAW_CONTENT_CHARS]).strip()[:MAX_CONTENT_CHARS]
+            logger.info(f"Extracted {len(content)} characters of content")
+            
+            # Extract specific content if selectors provided
+            specific_content = {}
+            if selectors:
+                logger.info(f"Extracting specific content with selectors: {selectors}")
+                for key, value in data["selectors"].items():
+                    if isinstance(value, str):
+                        logger.error(value)
+                        specific_content[key] = value
+                    elif not value:
+                        logger.warning(f"No elements found for selector '{key}'")
+                    else:
+                        texts = [text.strip() for text in value if text.strip()]
+                        logger.info(f"Found {len(texts)} elements for selector '{key}'")
+                        specific_content[key] = texts
+            
+            result = {
+                "url": url,
+                "title": title,
+                "description": description,
+                "content": content,
+                "specific_content": specific_content
+            }
+            
+            logger.info(f"Successfully scraped {url}")
+            return result
+            
+        except Exception as e:
+            logger.exception(f"Error scraping {url}: {str(e)}")
+            return {
+                "url": url,
+                "error": str(e)
+            }
+        finally:
+            await page.close()
+    
+    @staticmethod
+    async def close() -> None:
+        """Close the shared browser and stop Playwright"""
+        global _playwright, _browser, _context
+        async with _browser_lock:
+            _context = None
+            if _browser is not None:
+                await _browser.close()
+                _browser = None
+            if _playwright is not None:
+                await _playwright.stop()
+                _playwright = None
@@ -1,6 +1,6 @@
 import os
-import http.client
-import json
+import httpx
+import orjson
 import logging
 from typing import Dict, Any, List
 
@@ -8,11 +8,22 @@ from typing import Dict, Any, List
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+SERPER_HOST = "google.serper.dev"
+
+# Pooled HTTP/2 client reused by every search
+_client = httpx.AsyncClient(
+    base_url=f"https://{SERPER_HOST}",
+    http2=True,
+    headers={"Content-Type": "application/json"},
+    timeout=10.0,
+    limits=httpx.Limits(max_keepalive_connections=32)
+)
+
 class SearchService:
     """Service for performing Google searches using Serper API"""
     
     SERPER_API_KEY = os.getenv("SERPER_API_KEY")
-    SERPER_HOST = "google.serper.dev"
+    SERPER_HOST = SERPER_HOST
     
     @staticmethod
     async def search(query: str, num_results: int = 5) -> List[Dict[str, Any]]:
@@ -31,29 +42,24 @@ class SearchService:
             return [{"title": "Error", "link": "", "snippet": "API key not configured"}]
         
         try:
-            headers = {
-                "X-API-KEY": SearchService.SERPER_API_KEY,
-                "Content-Type": "application/json"
-            }
-            
-            payload = json.dumps({
+            payload = orjson.dumps({
                 "q": query,
                 "num": num_results
             })
             
             logger.info(f"Searching for: {query}")
             
-            conn = http.client.HTTPSConnection(SearchService.SERPER_HOST)
-            conn.request("POST", "/search", payload, headers)
+            response = await _client.post(
+                "/search",
+                content=payload,
+                headers={"X-API-KEY": SearchService.SERPER_API_KEY}
+            )
             
-            response = conn.getresponse()
-            response_data = response.read().decode('utf-8')
-            
-            if response.status != 200:
-                logger.error(f"Search API error: {response_data}")
-                return [{"title": "Error", "link": "", "snippet": f"API error: {response.status}"}]
+            if response.status_code != 200:
+                logger.error(f"Search API error: {response.text}")
+                return [{"title": "Error", "link": "", "snippet": f"API error: {response.status_code}"}]
                 
-            data = json.loads(response_data)
+            data = orjson.loads(response.content)
             
             results = []
             if "organic" in data:
@@ -66,8 +72,12 @@ class SearchService:
             
             logger.info(f"Found {len(results)} results")
             
-            conn.close()
             return results
         except Exception as e:
             logger.exception(f"Error in search: {str(e)}")
             return [{"title": "Error", "link": "", "snippet": f"Search failed: {str(e)}"}]
+    
+    @staticmethod
+    async def close() -> None:
+        """Close the pooled HTTP client"""
+        await _client.aclose()
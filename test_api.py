@@ -1,5 +1,7 @@
 import asyncio
 import json
+import orjson
+import zstandard
 import websockets
 import httpx
 import os
@@ -13,32 +15,30 @@ API_URL = "http://localhost:8000"
 API_KEY = "your-secret-api-key-12345"
 WS_URL = "ws://localhost:8000/ws/research"
 
-async def test_root_endpoint():
+async def test_root_endpoint(client: httpx.AsyncClient):
     """Test the root endpoint"""
     print("\n=== Testing Root Endpoint ===")
-    async with httpx.AsyncClient() as client:
-        response = await client.get(f"{API_URL}/")
-        print(f"Status Code: {response.status_code}")
-        print(f"Response: {response.json()}")
-        return response.status_code == 200
+    response = await client.get(f"{API_URL}/")
+    print(f"Status Code: {response.status_code}")
+    print(f"Response: {response.json()}")
+    return response.status_code == 200
 
-async def test_get_data_endpoint():
+async def test_get_data_endpoint(client: httpx.AsyncClient):
     """Test the getData endpoint"""
     print("\n=== Testing getData Endpoint ===")
     headers = {"X-API-Key": API_KEY}
     data = {"company_name": "OpenAI"}
     
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            f"{API_URL}/getData",
-            headers=headers,
-            json=data
-        )
-        print(f"Status Code: {response.status_code}")
-        print(f"Response: {json.dumps(response.json(), indent=2)}")
-        return response.status_code == 200
+    response = await client.post(
+        f"{API_URL}/getData",
+        headers=headers,
+        json=data
+    )
+    print(f"Status Code: {response.status_code}")
+    print(f"Response: {json.dumps(response.json(), indent=2)}")
+    return response.status_code == 200
 
-async def test_research_endpoint():
+async def test_research_endpoint(client: httpx.AsyncClient):
     """Test the research endpoint"""
     print("\n=== Testing Research Endpoint ===")
     headers = {"X-API-Key": API_KEY}
@@ -49,15 +49,14 @@ async def test_research_endpoint():
         }
     }
     
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            f"{API_URL}/research",
-            headers=headers,
-            json=data
-        )
-        print(f"Status Code: {response.status_code}")
-        print(f"Response: {json.dumps(response.json(), indent=2)}")
-        return response.status_code == 200
+    response = await client.post(
+        f"{API_URL}/research",
+        headers=headers,
+        json=data
+    )
+    print(f"Status Code: {response.status_code}")
+    print(f"Response: {json.dumps(response.json(), indent=2)}")
+    return response.status_code == 200
 
 async def test_websocket_endpoint():
     """Test the WebSocket endpoint"""
@@ -69,33 +68,50 @@ async def test_websocket_endpoint():
         "company_name": "Anthropic",
         "params": {
             "depth": "standard"
-        }
+        },
+        "compression": "zstd"
     }
     
     try:
         async with websockets.connect(WS_URL) as websocket:
             # Send initial message
-            await websocket.send(json.dumps(initial_message))
-            print(f"Sent: {json.dumps(initial_message)}")
+            payload = orjson.dumps(initial_message).decode()
+            await websocket.send(payload)
+            print(f"Sent: {payload}")
             
             # Listen for messages
             while True:
                 try:
                     message = await asyncio.wait_for(websocket.recv(), timeout=60)
-                    message_data = json.loads(message)
                     
-                    print(f"Received: {message_data['type']}")
+                    # Large results arrive as zstd-compressed binary frames
+                    if isinstance(message, bytes) and message.startswith(b"ZSTD"):
+                        message = zstandard.ZstdDecompressor().decompress(message[4:])
+                    frame = orjson.loads(message)
                     
-                    if message_data["type"] == "progress" or message_data["type"] == "tool":
-                        print(f"  {message_data['message']}")
+                    # Batch frames carry several messages in order
+                    messages = frame["items"] if frame["type"] == "batch" else [frame]
                     
-                    if message_data["type"] == "result":
-                        print(f"  Result received with {len(message_data['data'].get('dashboard_components', []))} components")
-                        return True
+                    # Expand phase batches into their phase messages
+                    messages = [
+                        item
+                        for message_data in messages
+                        for item in (message_data["messages"] if message_data["type"] == "phase_batch" else [message_data])
+                    ]
                     
-                    if message_data["type"] == "error":
-                        print(f"  Error: {message_data['message']}")
-                        return False
+                    for message_data in messages:
+                        print(f"Received: {message_data['type']}")
+                        
+                        if message_data["type"] in ("phase", "progress", "tool"):
+                            print(f"  {message_data['message']}")
+                        
+                        if message_data["type"] == "result":
+                            print(f"  Result received with {len(message_data['data'].get('dashboard_components', []))} components")
+                            return True
+                        
+                        if message_data["type"] == "error":
+                            print(f"  Error: {message_data['message']}")
+                            return False
                     
                 except asyncio.TimeoutError:
                     print("Timeout waiting for response")
@@ -108,18 +124,17 @@ async def main():
     """Run all tests"""
     print("=== Starting API Tests ===")
     
-    # Test root endpoint
-    root_success = await test_root_endpoint()
-    
-    # Test getData endpoint
-    get_data_success = await test_get_data_endpoint()
-    
-    # Test research endpoint
-    research_success = await test_research_endpoint()
+    # Run the HTTP endpoint tests concurrently over one shared client
+    async with httpx.AsyncClient() as client:
+        root_success, get_data_success, research_success = await asyncio.gather(
+            test_root_endpoint(client),
+            test_get_data_endpoint(client),
+            test_research_endpoint(client)
+        )
     
     # Ask user if they want to test the WebSocket endpoint
     print("\nDo you want to test the WebSocket endpoint? This may take a few minutes. (y/n)")
-    choice = input().lower()
+    choice = (await asyncio.to_thread(input)).lower()
     
     websocket_success = None
     if choice == 'y':
@@ -4,6 +4,8 @@ VC Research Engine
 This package contains the agents and tools for the VC Research Engine.
 """
 
+# Install the shared OpenAI client before any agent is created
+from vc_agents.client import openai_client
 from vc_agents.orchestrator import ResearchOrchestrator
 from vc_agents.models import ResearchOutput
 
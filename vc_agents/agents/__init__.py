@@ -6,7 +6,7 @@ This package contains specialized agents for different aspects of startup resear
 
 from vc_agents.agents.company_agent import company_overview_agent, get_company_overview
 from vc_agents.agents.people_agent import key_people_agent, get_team_analysis
-from vc_agents.agents.market_agent import market_analysis_agent, get_market_analysis
+from vc_agents.agents.market_agent import market_analysis_agent, market_synthesizer_agent, get_market_analysis
 from vc_agents.agents.competitor_agent import competitor_analysis_agent, get_competitor_analysis
 from vc_agents.agents.metrics_agent import (
     growth_metrics_agent, get_growth_metrics,
@@ -16,7 +16,7 @@ from vc_agents.agents.metrics_agent import (
     risk_assessment_agent, get_risk_assessment,
     investment_analysis_agent, get_investment_analysis,
     media_news_agent, get_media_news,
-    research_metadata_agent, get_research_metadata
+    get_research_metadata, build_research_metadata
 )
 
 __all__ = [
@@ -25,6 +25,7 @@ __all__ = [
     'key_people_agent',
     'get_team_analysis',
     'market_analysis_agent',
+    'market_synthesizer_agent',
     'get_market_analysis',
     'competitor_analysis_agent',
     'get_competitor_analysis',
@@ -42,6 +43,6 @@ __all__ = [
     'get_investment_analysis',
     'media_news_agent',
     'get_media_news',
-    'research_metadata_agent',
-    'get_research_metadata'
+    'get_research_metadata',
+    'build_research_metadata'
 ]
@@ -9,14 +9,17 @@ from typing import Dict, Any, List, Optional
 from pydantic import BaseModel
 from agents import Agent, ModelSettings, function_tool
 
-from vc_agents.tools import search_google, scrape_website, run_python_code
+from vc_agents.prompts import BASE_INSTRUCTIONS, output_schema
+from vc_agents.runtime import run_agent
+from vc_agents.tools import search_google, scrape_website, batch_scrape_websites, run_python_code, json_output
+from vc_agents.cache import cached_agent_result, dump_output
 from vc_agents.models import CompanyInfo
 
 # Create the company overview agent
 company_overview_agent = Agent(
     name="Company Overview Agent",
     handoff_description="Specialist agent for gathering basic company information",
-    instructions="""
+    instructions=BASE_INSTRUCTIONS + """
     You are a Company Overview Research Agent specializing in gathering basic information about startups.
     
     Your task is to research and collect the following information:
@@ -32,7 +35,7 @@ company_overview_agent = Agent(
     10. Revenue model (e.g., SaaS, Enterprise Sales, etc.)
     11. Industry (main industry or sector)
     
-    Use the search_google tool to find relevant information and the scrape_website tool to extract details from specific websites. You can also use the run_python_code tool to execute Python code for any calculations or data processing you need to perform.
+    You can also use the run_python_code tool to execute Python code for any calculations or data processing you need to perform.
     
     Focus on authoritative sources like:
     - The company's official website
@@ -60,15 +63,17 @@ company_overview_agent = Agent(
     
     It is CRITICAL that you follow this exact JSON structure. The system will break if you don't follow it precisely.
     """,
-    tools=[search_google, scrape_website, run_python_code],
+    tools=[search_google, scrape_website, batch_scrape_websites, run_python_code],
     model="gpt-4o",
     model_settings=ModelSettings(
         temperature=0.2
     ),
-    output_type=CompanyInfo
+    output_type=output_schema(CompanyInfo)
 )
 
+@json_output
 @function_tool
+@cached_agent_result("company")
 async def get_company_overview(company_name: str) -> Dict[str, Any]:
     """
     Get comprehensive overview information about a company.
@@ -79,13 +84,11 @@ async def get_company_overview(company_name: str) -> Dict[str, Any]:
     Returns:
         A dictionary containing basic company information
     """
-    from agents import Runner
-    
     # Run the company overview agent
-    result = await Runner.run(
+    result = await run_agent(
         company_overview_agent,
         input=f"Research basic information about the company: {company_name}"
     )
     
     # Return the structured output
-    return result.final_output_as(CompanyInfo).model_dump()
+    return await dump_output(result.final_output_as(CompanyInfo), CompanyInfo)
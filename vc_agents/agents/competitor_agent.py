@@ -9,14 +9,17 @@ from typing import Dict, Any, List, Optional
 from pydantic import BaseModel
 from agents import Agent, ModelSettings, function_tool
 
-from vc_agents.tools import search_google, scrape_website, run_python_code
+from vc_agents.prompts import BASE_INSTRUCTIONS, output_schema
+from vc_agents.runtime import run_agent
+from vc_agents.tools import search_google, scrape_website, batch_scrape_websites, run_python_code, json_output
+from vc_agents.cache import cached_agent_result, dump_output
 from vc_agents.models import CompetitiveLandscape, Competitor, IndirectCompetitor, ComparisonChart, CompanyComparison
 
 # Create the competitor analysis agent
 competitor_analysis_agent = Agent(
     name="Competitor Analysis Agent",
     handoff_description="Specialist agent for researching competitors and competitive landscape",
-    instructions="""
+    instructions=BASE_INSTRUCTIONS + """
     You are a Competitor Analysis Research Agent specializing in mapping the competitive landscape for startups.
     
     Your task is to research and identify:
@@ -31,7 +34,7 @@ competitor_analysis_agent = Agent(
     - Analyze the company's competitive advantages and differentiators
     - Create a comparison chart with 4-5 key categories/features
     
-    Use the search_google tool to find relevant information and the scrape_website tool to extract details from specific websites. You can also use the run_python_code tool to execute Python code for any calculations or data processing you need to perform, such as analyzing competitor data, calculating market shares, or creating comparison matrices.
+    You can also use the run_python_code tool to execute Python code for any calculations or data processing you need to perform, such as analyzing competitor data, calculating market shares, or creating comparison matrices.
     
     Focus on authoritative sources like:
     - The company's official website (especially comparison pages)
@@ -96,15 +99,17 @@ competitor_analysis_agent = Agent(
     
     It is CRITICAL that you follow this exact JSON structure. The system will break if you don't follow it precisely.
     """,
-    tools=[search_google, scrape_website, run_python_code],
+    tools=[search_google, scrape_website, batch_scrape_websites, run_python_code],
     model="gpt-4o",
     model_settings=ModelSettings(
         temperature=0.2
     ),
-    output_type=CompetitiveLandscape
+    output_type=output_schema(CompetitiveLandscape)
 )
 
+@json_output
 @function_tool
+@cached_agent_result("competitor")
 async def get_competitor_analysis(company_name: str) -> Dict[str, Any]:
     """
     Get competitor analysis for a company.
@@ -115,13 +120,11 @@ async def get_competitor_analysis(company_name: str) -> Dict[str, Any]:
     Returns:
         A dictionary containing competitor analysis information
     """
-    from agents import Runner
-    
     # Run the competitor analysis agent
-    result = await Runner.run(
+    result = await run_agent(
         competitor_analysis_agent,
         input=f"Research the competitors and competitive landscape for: {company_name}"
     )
     
     # Return the structured output
-    return result.final_output_as(CompetitiveLandscape).model_dump()
+    return await dump_output(result.final_output_as(CompetitiveLandscape), CompetitiveLandscape)
@@ -3,38 +3,115 @@ Market Analysis Agent for VC Research Engine
 
 This agent specializes in researching market sizes, including TAM (Total Addressable Market),
 SAM (Serviceable Addressable Market), and SOM (Serviceable Obtainable Market) for startups.
+Research runs on a smaller model and hands off to a synthesis agent for the final output.
 """
 
-from typing import Dict, Any, List, Optional
-from pydantic import BaseModel
-from agents import Agent, ModelSettings, function_tool
+from typing import Dict, Any, Callable, List, Optional
+import asyncio
+import os
+import re
+import orjson
+from agents import Agent, ModelSettings, RunResult, StreamEvent, function_tool
 
-from vc_agents.tools import search_google, scrape_website, run_python_code
+from vc_agents.cache import cached_agent_result, dump_output
+from vc_agents.prompts import BASE_INSTRUCTIONS, output_schema
+from vc_agents.runtime import run_agent, run_agent_streamed
+from vc_agents.tools import search_google, scrape_website, batch_scrape_websites, run_python_code, with_concurrency_limit, map_tool_output, BATCH_SCRAPE_SEPARATOR, json_output
 from vc_agents.models import MarketAnalysis, MarketSize, MarketTrend
 
+# Scraped pages longer than this are cut down to their market facts before
+# they enter the agent's context, where every later turn would re-read them
+MARKET_SCRAPE_MAX_CHARS = int(os.getenv("MARKET_SCRAPE_MAX_CHARS", "4000"))
+
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+_MARKET_FACT_RE = re.compile(r"[$€£%]|\b(?:cagr|market|billion|million|revenue|growth|share)\b|\b(?:19|20)\d{2}\b", re.IGNORECASE)
+_MAIN_CONTENT_MARKER = "--- MAIN CONTENT ---\n\n"
+
+def _keep_market_facts(output: str) -> str:
+    """Keep only the sentences of a long scrape that carry market-size facts"""
+    if len(output) <= MARKET_SCRAPE_MAX_CHARS:
+        return output
+    header, marker, content = output.partition(_MAIN_CONTENT_MARKER)
+    if not marker:
+        header, content = "", output
+    
+    kept = []
+    budget = MARKET_SCRAPE_MAX_CHARS - len(header)
+    for sentence in _SENTENCE_SPLIT_RE.split(content):
+        if _MARKET_FACT_RE.search(sentence):
+            budget -= len(sentence) + 1
+            if budget < 0:
+                break
+            kept.append(sentence)
+    
+    return f"{header}{marker}{' '.join(kept)}\n\n[Content filtered to sentences with market-size facts]"
+
+def _keep_market_facts_per_page(output: str) -> str:
+    """Apply _keep_market_facts to each page of a batch scrape"""
+    return BATCH_SCRAPE_SEPARATOR.join(map(_keep_market_facts, output.split(BATCH_SCRAPE_SEPARATOR)))
+
+# Final structured write-up runs on the larger model, with no tools
+market_synthesizer_agent = Agent(
+    name="Market Synthesis Agent",
+    handoff_description="Specialist agent that turns gathered market research into the final TAM/SAM/SOM analysis",
+    instructions="""
+    You are a Market Synthesis Agent. The conversation so far contains the search results, scraped pages and calculations gathered by the Market Analysis Agent for a startup.
+    
+    Using only that research, produce the final market analysis:
+    1. Total Addressable Market (TAM) - The total market demand for a product or service
+    2. Serviceable Addressable Market (SAM) - The portion of TAM targeted by the company's products and services
+    3. Serviceable Obtainable Market (SOM) - The portion of SAM that the company can realistically capture
+    4. Market Trends - At least 2 significant trends affecting the market and the company
+    
+    For each market size estimate, provide a numerical value (in $ billions/millions), the year of the estimate, the growth rate (CAGR) when available, a detailed description of the methodology used, and the sources.
+    
+    When estimates conflict, provide a range and explain the discrepancy.
+    If precise numbers aren't available, provide a reasonable estimate based on available data and clearly mark it as an estimate.
+    
+    Return a MarketAnalysis object; its schema is enforced through structured output.
+    """,
+    model="gpt-4o",
+    model_settings=ModelSettings(
+        temperature=0.2,
+        max_tokens=2048,
+        # Route calls sharing the static instructions to the same prompt cache
+        extra_args={"prompt_cache_key": "market-synthesis"}
+    ),
+    output_type=output_schema(MarketAnalysis)
+)
+
 # Create the market analysis agent
+# Research turns (planning searches, reading scraped pages) run on the smaller
+# model; the agent always ends by handing off to the synthesizer above
 market_analysis_agent = Agent(
     name="Market Analysis Agent",
     handoff_description="Specialist agent for researching market sizes (TAM/SAM/SOM) and market trends",
-    instructions="""
+    instructions=BASE_INSTRUCTIONS + """
     You are a Market Analysis Research Agent specializing in estimating market sizes and identifying market trends for startups.
     
-    Your task is to research and estimate the following:
+    Your task is to gather the evidence needed to estimate the following:
     1. Total Addressable Market (TAM) - The total market demand for a product or service
     2. Serviceable Addressable Market (SAM) - The portion of TAM targeted by the company's products and services
     3. Serviceable Obtainable Market (SOM) - The portion of SAM that the company can realistically capture
     4. Market Trends - Key trends affecting the market and the company
     
-    For each market size estimate, you must:
-    - Provide a numerical value (in $ billions/millions)
-    - Include the year of the estimate
-    - Include growth rates (CAGR) when available
-    - Provide a detailed description of the methodology used
-    - Cite your sources
+    For each market size estimate, find:
+    - A numerical value (in $ billions/millions)
+    - The year of the estimate
+    - Growth rates (CAGR) when available
+    - The methodology behind the number
+    - The sources
+    
+    For market trends, identify at least 2 significant trends affecting the market and their impact.
     
-    For market trends, identify at least 2 significant trends affecting the market and provide:
-    - A clear name for the trend
-    - A detailed description of the trend and its impact
+    Step 0 - Planning:
+    Your FIRST response MUST contain 5 parallel search_google tool calls, one for each independent sub-question:
+    (a) the TAM of the company's industry
+    (b) the SAM of the company's target segment
+    (c) revenues of the company's main competitors
+    (d) annual reports and filings of comparable public companies
+    (e) current market trends in the company's industry
+    Do not reason between these calls. Once the results are back, scrape the most promising sources (again in parallel where possible) and calculate the estimates.
     
     Use these specific techniques for market size research:
     1. Industry Report Method: Search for market research reports from firms like Gartner, Forrester, or IDC
@@ -43,56 +120,151 @@ market_analysis_agent = Agent(
     4. Bottom-up Calculation: Estimate (Total potential customers) × (Average selling price)
     5. Investor Presentation Method: Search for market size data in startup pitch decks or investor presentations
     
-    Use the search_google tool to find relevant information and the scrape_website tool to extract details from specific websites. You can also use the run_python_code tool to execute Python code for any calculations or data processing you need to perform, such as calculating market sizes, growth rates, or creating data visualizations.
+    You can also use the run_python_code tool to execute Python code for any calculations or data processing you need to perform, such as calculating market sizes, growth rates, or creating data visualizations.
     
-    When estimates conflict, provide a range and explain the discrepancy.
-    If precise numbers aren't available, provide a reasonable estimate based on available data and clearly mark it as an estimate.
-    
-    Your final output MUST be a JSON object with the following structure:
-    {
-      "tam": {
-        "size": "$X billion",
-        "year": 2023,
-        "cagr": "X%",
-        "description": "Detailed description of the Total Addressable Market with methodology",
-        "sources": ["Source 1", "Source 2"]
-      },
-      "sam": {
-        "size": "$X million",
-        "year": 2023,
-        "cagr": "X%",
-        "description": "Detailed description of the Serviceable Addressable Market with methodology",
-        "sources": ["Source 1", "Source 2"]
-      },
-      "som": {
-        "size": "$X million",
-        "year": 2023,
-        "cagr": "X%",
-        "description": "Detailed description of the Serviceable Obtainable Market with methodology",
-        "sources": ["Source 1", "Source 2"]
-      },
-      "market_trends": [
-        {
-          "trend": "Trend Name 1",
-          "description": "Detailed description of the trend and its impact"
-        },
-        {
-          "trend": "Trend Name 2",
-          "description": "Detailed description of the trend and its impact"
-        }
-      ]
-    }
-    
-    It is CRITICAL that you follow this exact JSON structure. The system will break if you don't follow it precisely.
+    When you have gathered enough evidence for all four parts, hand off to the Market Synthesis Agent. Do not write the final analysis yourself.
     """,
-    tools=[search_google, scrape_website, run_python_code],
-    model="gpt-4o",
+    # Tool calls from one model turn run concurrently, up to TOOL_CONCURRENCY_LIMIT at a time per run
+    tools=with_concurrency_limit([search_google, map_tool_output(scrape_website, _keep_market_facts), map_tool_output(batch_scrape_websites, _keep_market_facts_per_page), run_python_code]),
+    handoffs=[market_synthesizer_agent],
+    model="gpt-4o-mini",
     model_settings=ModelSettings(
-        temperature=0.2
+        temperature=0.2,
+        max_tokens=1024,
+        # Let the model emit the planned searches as one batch of tool calls
+        parallel_tool_calls=True,
+        # Every turn is a tool call or the handoff, so the run always ends in the synthesizer
+        tool_choice="required",
+        # Route calls sharing the static instructions to the same prompt cache
+        extra_args={"prompt_cache_key": "market-analysis"}
     ),
-    output_type=MarketAnalysis
+    # Keep tool_choice="required" after the first tool call
+    reset_tool_choice=False
 )
 
+# Turn budget per market run; every researcher turn is a tool call or the
+# handoff, so it needs more than the SDK's default of 10
+MARKET_MAX_TURNS = int(os.getenv("MARKET_MAX_TURNS", "20"))
+
+# Number of independent runs raced per analysis; the first valid result wins
+MARKET_ANALYSIS_RUNS = int(os.getenv("MARKET_ANALYSIS_RUNS", "3"))
+
+# Run inputs, each leading with a different sizing method; the company name
+# comes last so the static instructions and wording form a shared cached prefix
+_MARKET_ANALYSIS_INPUTS = (
+    "Lead with the Industry Report Method. Research the market size (TAM, SAM, and SOM) and market trends for: {company_name}",
+    "Lead with the Bottom-up Calculation. Research the market size (TAM, SAM, and SOM) and market trends for: {company_name}",
+    "Lead with the Public Company Method. Research the market size (TAM, SAM, and SOM) and market trends for: {company_name}"
+)
+
+class _TopLevelFieldParser:
+    """
+    Incrementally scan a streamed JSON object and return each top-level
+    member as soon as its value is complete.
+    """
+    
+    def __init__(self):
+        self._buffer = ""
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._member_start = 0
+    
+    def feed(self, delta: str) -> List[tuple]:
+        """Add streamed text and return the (key, value) pairs it completed"""
+        completed = []
+        offset = len(self._buffer)
+        self._buffer += delta
+        for i, char in enumerate(delta, offset):
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+                if self._depth == 1:
+                    self._member_start = i + 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    completed.extend(self._parse_member(i))
+            elif char == "," and self._depth == 1:
+                completed.extend(self._parse_member(i))
+                self._member_start = i + 1
+        return completed
+    
+    def _parse_member(self, end: int) -> List[tuple]:
+        member = self._buffer[self._member_start:end].strip()
+        if not member:
+            return []
+        return list(orjson.loads("{" + member + "}").items())
+
+async def run_market_agent(input: str, on_partial: Optional[Callable[[str, Any], None]] = None) -> RunResult:
+    """
+    Run the market analysis agent once, with a turn budget of MARKET_MAX_TURNS.
+    
+    Args:
+        input: The agent input
+        on_partial: Optional callback that receives (field, value) as soon as the
+            synthesizer finishes writing a top-level field (tam, sam, som,
+            market_trends), before the run completes
+        
+    Returns:
+        The run result
+    """
+    if on_partial is None:
+        return await run_agent(market_analysis_agent, input, max_turns=MARKET_MAX_TURNS)
+    
+    parser = None
+    
+    def on_event(event: StreamEvent) -> None:
+        nonlocal parser
+        if event.type == "agent_updated_stream_event":
+            # Only the synthesizer writes the structured output
+            parser = _TopLevelFieldParser() if event.new_agent is market_synthesizer_agent else None
+        elif parser is not None and event.type == "raw_response_event" and event.data.type == "response.output_text.delta":
+            for key, value in parser.feed(event.data.delta):
+                on_partial(key, value)
+    
+    return await run_agent_streamed(market_analysis_agent, input, on_event, max_turns=MARKET_MAX_TURNS)
+
+async def run_market_analysis(company_name: str) -> Dict[str, Any]:
+    """
+    Race several runs of the market analysis agent and return the first valid output.
+    
+    Args:
+        company_name: The name of the company to research
+        
+    Returns:
+        A dictionary containing TAM, SAM, SOM, and market trends information
+    """
+    inputs = [template.format(company_name=company_name) for template in _MARKET_ANALYSIS_INPUTS[:max(1, MARKET_ANALYSIS_RUNS)]]
+    tasks = [asyncio.create_task(run_market_agent(input)) for input in inputs]
+    
+    try:
+        error = None
+        for next_done in asyncio.as_completed(tasks):
+            try:
+                result = await next_done
+                # Return the structured output
+                return await dump_output(result.final_output_as(MarketAnalysis, raise_if_incorrect_type=True), MarketAnalysis)
+            except Exception as e:
+                error = e
+        raise error
+    finally:
+        # Stop the runs that lost the race
+        for task in tasks:
+            task.cancel()
+
+# Finished analyses are cached per company
+_cached_market_analysis = cached_agent_result("market")(run_market_analysis)
+
+@json_output
 @function_tool
 async def get_market_analysis(company_name: str) -> Dict[str, Any]:
     """
@@ -104,13 +276,4 @@ async def get_market_analysis(company_name: str) -> Dict[str, Any]:
     Returns:
         A dictionary containing TAM, SAM, SOM, and market trends information
     """
-    from agents import Runner
-    
-    # Run the market analysis agent
-    result = await Runner.run(
-        market_analysis_agent,
-        input=f"Research the market size (TAM, SAM, and SOM) and market trends for: {company_name}"
-    )
-    
-    # Return the structured output
-    return result.final_output_as(MarketAnalysis).model_dump()
+    return await _cached_market_analysis(company_name)
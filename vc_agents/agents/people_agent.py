@@ -9,14 +9,17 @@ from typing import Dict, Any, List, Optional
 from pydantic import BaseModel
 from agents import Agent, ModelSettings, function_tool
 
-from vc_agents.tools import search_google, scrape_website, run_python_code
+from vc_agents.cache import cached_agent_result, dump_output
+from vc_agents.prompts import BASE_INSTRUCTIONS, output_schema
+from vc_agents.runtime import run_agent
+from vc_agents.tools import search_google, scrape_website, batch_scrape_websites, run_python_code, json_output
 from vc_agents.models import TeamAnalysis, Person, BoardMember, Advisor
 
 # Create the team analysis agent
 key_people_agent = Agent(
     name="Team Analysis Agent",
     handoff_description="Specialist agent for researching founders, executives, board members, and advisors",
-    instructions="""
+    instructions=BASE_INSTRUCTIONS + """
     You are a Team Analysis Research Agent specializing in gathering information about founders, 
     executives, board members, advisors, and key team members of startups.
     
@@ -49,7 +52,7 @@ key_people_agent = Agent(
     - Key advisors
     - Other significant team members
     
-    Use the search_google tool to find relevant information and the scrape_website tool to extract details from specific websites. You can also use the run_python_code tool to execute Python code for any calculations or data processing you need to perform, such as analyzing team composition, extracting patterns from career histories, or processing data about team members.
+    You can also use the run_python_code tool to execute Python code for any calculations or data processing you need to perform, such as analyzing team composition, extracting patterns from career histories, or processing data about team members.
     
     Focus on authoritative sources like:
     - The company's official website (team/about pages)
@@ -93,15 +96,17 @@ key_people_agent = Agent(
     
     Aim to find at least 3-5 key people, prioritizing founders and C-level executives.
     """,
-    tools=[search_google, scrape_website, run_python_code],
+    tools=[search_google, scrape_website, batch_scrape_websites, run_python_code],
     model="gpt-4o",
     model_settings=ModelSettings(
         temperature=0.2
     ),
-    output_type=TeamAnalysis
+    output_type=output_schema(TeamAnalysis)
 )
 
+@json_output
 @function_tool
+@cached_agent_result("team")
 async def get_team_analysis(company_name: str) -> Dict[str, Any]:
     """
     Get comprehensive team analysis including key people, board members, and advisors of a company.
@@ -112,13 +117,11 @@ async def get_team_analysis(company_name: str) -> Dict[str, Any]:
     Returns:
         A dictionary containing information about the team
     """
-    from agents import Runner
-    
     # Run the team analysis agent
-    result = await Runner.run(
+    result = await run_agent(
         key_people_agent,
         input=f"Research the team (founders, executives, board members, and advisors) of: {company_name}"
     )
     
     # Return the structured output
-    return result.final_output_as(TeamAnalysis).model_dump()
+    return await dump_output(result.final_output_as(TeamAnalysis), TeamAnalysis)
@@ -0,0 +1,192 @@
+"""
+Result Caches for VC Research Engine
+
+This module provides an async LRU + TTL cache and uses it to cache specialist
+agent results per company. Concurrent calls for the same key share one
+in-flight call, so duplicate requests (retries, test harnesses, repeated
+research) cost a single LLM chain or network round trip.
+"""
+
+import asyncio
+import copy
+import functools
+import hashlib
+import os
+import time
+import orjson
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+from pydantic import TypeAdapter
+from agents import Agent
+from vc_agents.runtime import run_agent
+
+# How long a finished agent result stays valid, and how many results are kept
+AGENT_CACHE_TTL = float(os.getenv("AGENT_CACHE_TTL_SECONDS", "3600"))
+AGENT_CACHE_MAXSIZE = int(os.getenv("AGENT_CACHE_MAXSIZE", "1024"))
+
+class AsyncTTLCache:
+    """
+    Cache of async call results with per-entry TTL and optional LRU bound.
+
+    Each entry holds the task producing the value, so callers arriving while
+    the first call is still running await the same task. Failed or cancelled
+    calls, and results rejected by cache_if, are evicted once they finish.
+    """
+
+    def __init__(self, ttl: float, maxsize: Optional[int] = None):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Tuple[float, asyncio.Task]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    async def get_or_run(
+        self,
+        key: Hashable,
+        factory: Callable[[], Awaitable[Any]],
+        cache_if: Optional[Callable[[Any], bool]] = None,
+        ttl: Optional[float] = None
+    ) -> Any:
+        """
+        Return the cached value for key, calling factory on a miss.
+
+        Args:
+            key: Cache key
+            factory: Called without arguments to produce the value
+            cache_if: Optional predicate; results it rejects are not kept
+            ttl: Seconds to keep this entry, defaults to the cache TTL
+
+        Returns:
+            The cached or freshly produced value
+        """
+        now = time.monotonic()
+        entry = self._entries.get(key)
+
+        if entry is not None and entry[0] > now:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            task = entry[1]
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(factory())
+            self._entries[key] = (now + (self.ttl if ttl is None else ttl), task)
+            self._entries.move_to_end(key)
+            self._evict(now)
+            task.add_done_callback(functools.partial(self._on_done, key, cache_if))
+
+        # Shield the shared call so one cancelled caller does not cancel it for the others
+        return await asyncio.shield(task)
+
+    def clear(self) -> None:
+        """Forget all entries"""
+        self._entries.clear()
+
+    def _on_done(self, key: Hashable, cache_if: Optional[Callable[[Any], bool]], task: asyncio.Task) -> None:
+        entry = self._entries.get(key)
+        if entry is None or entry[1] is not task:
+            return
+        if task.cancelled() or task.exception() is not None or (cache_if is not None and not cache_if(task.result())):
+            del self._entries[key]
+
+    def _evict(self, now: float) -> None:
+        for key in [key for key, (expires, _) in self._entries.items() if expires <= now]:
+            del self._entries[key]
+        if self.maxsize is not None:
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+# Agent results, keyed by (agent name, company name) or by agent_cache_key
+_agent_results = AsyncTTLCache(ttl=AGENT_CACHE_TTL, maxsize=AGENT_CACHE_MAXSIZE)
+
+def agent_cache_key(agent: Agent, input: str) -> str:
+    """Hash everything that determines an agent's answer: name, input, model and temperature"""
+    return hashlib.sha256(orjson.dumps({
+        "agent": agent.name,
+        "input": input,
+        "model": str(agent.model),
+        "temperature": agent.model_settings.temperature
+    }, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+def normalize_company_name(company_name: str) -> str:
+    """Company name without surrounding or repeated whitespace"""
+    return " ".join(company_name.split())
+
+@functools.lru_cache(maxsize=None)
+def _type_adapter(output_type: type) -> TypeAdapter:
+    """Serializer for an agent output type, built once per type"""
+    return TypeAdapter(output_type)
+
+async def dump_output(output: Any, output_type: type) -> Dict[str, Any]:
+    """
+    Dump an agent's structured output to a JSON-ready dict, without fields that are None.
+
+    Every get_* tool serializes its output through this, so they all return the same shape.
+
+    Args:
+        output: The agent output
+        output_type: The Pydantic model the agent produces
+
+    Returns:
+        The output dumped to a dictionary
+    """
+    # Dumping long outputs takes milliseconds; keep that off the event loop
+    return await asyncio.to_thread(_type_adapter(output_type).dump_python, output, mode="json", exclude_none=True)
+
+async def run_agent_cached(agent: Agent, input: str, output_type: type) -> Dict[str, Any]:
+    """
+    Run an agent and return its structured output as a dict, reusing a cached result.
+
+    Args:
+        agent: The agent to run
+        input: The agent input
+        output_type: The Pydantic model the agent produces
+
+    Returns:
+        The output dumped to a dictionary, without fields that are None
+    """
+    async def run() -> Dict[str, Any]:
+        result = await run_agent(agent, input)
+        return await dump_output(result.final_output_as(output_type), output_type)
+
+    result = await _agent_results.get_or_run(agent_cache_key(agent, input), run)
+    return copy.deepcopy(result)
+
+def cached_agent_result(agent_name: str, ttl: float = AGENT_CACHE_TTL):
+    """
+    Cache an async agent call keyed by (agent_name, company_name).
+
+    Company names are compared case- and whitespace-insensitively, so
+    "Acme" and " acme " share one entry.
+
+    The first call for a key starts the run as a task; later calls within
+    the TTL await the same task, whether it is still running or finished.
+    Failed runs are evicted so the next call retries.
+
+    Args:
+        agent_name: Name used to separate results of different agents
+        ttl: Seconds a result stays cached
+
+    Returns:
+        A decorator for async functions taking company_name
+    """
+    def decorator(func: Callable[[str], Awaitable[Dict[str, Any]]]):
+        @functools.wraps(func)
+        async def wrapper(company_name: str) -> Dict[str, Any]:
+            result = await _agent_results.get_or_run(
+                (agent_name, normalize_company_name(company_name).lower()),
+                lambda: func(company_name),
+                ttl=ttl
+            )
+            return copy.deepcopy(result)
+
+        return wrapper
+
+    return decorator
+
+def clear_agent_cache() -> None:
+    """Forget all cached agent results"""
+    _agent_results.clear()
+
+def agent_cache_stats() -> Dict[str, int]:
+    """Return hit and miss counts of the agent result cache"""
+    return {"hits": _agent_results.hits, "misses": _agent_results.misses}
@@ -0,0 +1,50 @@
+"""
+OpenAI Client for VC Research Engine
+
+This module creates the single AsyncOpenAI client used by every agent run.
+Registering it as the SDK default means all Runner.run calls share one
+pooled HTTP connection set instead of re-establishing connections per run.
+"""
+
+import os
+import httpx
+from openai import AsyncOpenAI
+from agents import set_default_openai_client
+
+# Pooled HTTP/2 transport shared by every client instance; concurrent agent
+# runs multiplex their requests over the same connections
+_http_client = httpx.AsyncClient(
+    http2=True,
+    limits=httpx.Limits(max_keepalive_connections=50, max_connections=100)
+)
+
+def _create_client() -> AsyncOpenAI:
+    """Create an AsyncOpenAI client from the current environment"""
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise RuntimeError("OPENAI_API_KEY is not set in environment variables")
+    return AsyncOpenAI(api_key=api_key, http_client=_http_client)
+
+# Shared client used by all agents
+openai_client = _create_client()
+set_default_openai_client(openai_client)
+
+def reload_openai_client() -> AsyncOpenAI:
+    """
+    Re-read OPENAI_API_KEY and install a new default client.
+
+    Use this for key rotation instead of re-reading the environment per
+    request; main.py calls it on SIGHUP. The new client keeps using the
+    existing connection pool.
+
+    Returns:
+        The newly installed client
+    """
+    global openai_client
+    openai_client = _create_client()
+    set_default_openai_client(openai_client)
+    return openai_client
+
+async def close_openai_client() -> None:
+    """Close the pooled HTTP transport on shutdown"""
+    await _http_client.aclose()
@@ -4,11 +4,15 @@ Models for VC Research Engine
 This module defines the Pydantic models for the research output schema.
 """
 
-from typing import Dict, Any, List, Optional, Union
-from pydantic import BaseModel, Field
+from typing import Dict, Any, List, Optional, TypedDict, Union
+from pydantic import BaseModel, ConfigDict, Field
+
+class FrozenModel(BaseModel):
+    """Base for the research models; instances are immutable once validated"""
+    model_config = ConfigDict(frozen=True)
 
 # Company Info Models
-class CompanyInfo(BaseModel):
+class CompanyInfo(FrozenModel):
     name: str
     tagline: str
     description: str
@@ -22,175 +26,175 @@ class CompanyInfo(BaseModel):
     industry: str
 
 # Market Analysis Models
-class MarketSize(BaseModel):
+class MarketSize(FrozenModel):
     size: str
     year: int
     cagr: str
     description: str
     sources: List[str]
 
-class MarketTrend(BaseModel):
+class MarketTrend(FrozenModel):
     trend: str
     description: str
 
-class MarketAnalysis(BaseModel):
+class MarketAnalysis(FrozenModel):
     tam: MarketSize
     sam: MarketSize
     som: MarketSize
     market_trends: List[MarketTrend]
 
 # Financial Metrics Models
-class FundingRound(BaseModel):
+class FundingRound(FrozenModel):
     date: str
     round_type: str
     amount: str
     valuation: Optional[str] = None
     lead_investors: List[str]
 
-class LastRound(BaseModel):
+class LastRound(FrozenModel):
     date: str
     amount: str
     round_type: str
     lead_investors: List[str]
 
-class Revenue(BaseModel):
+class Revenue(FrozenModel):
     current_arr: str
     growth_rate: str
     burn_rate: str
     runway: str
 
-class Valuation(BaseModel):
+class Valuation(FrozenModel):
     current: str
     date: str
     multiple: str
 
-class UnitEconomics(BaseModel):
+class UnitEconomics(FrozenModel):
     cac: str
     ltv: str
     ltv_cac_ratio: str
     gross_margin: str
     payback_period: str
 
-class Funding(BaseModel):
+class Funding(FrozenModel):
     total_raised: str
     last_round: LastRound
     funding_history: List[FundingRound]
     notable_investors: List[str]
 
-class FinancialMetrics(BaseModel):
+class FinancialMetrics(FrozenModel):
     funding: Funding
     revenue: Revenue
     valuation: Valuation
     unit_economics: UnitEconomics
 
 # Growth Metrics Models
-class QuarterlyData(BaseModel):
+class QuarterlyData(FrozenModel):
     quarter: str
     revenue: str
 
-class UserGrowth(BaseModel):
+class UserGrowth(FrozenModel):
     current_users: str
     growth_rate: str
     description: str
 
-class RevenueGrowth(BaseModel):
+class RevenueGrowth(FrozenModel):
     description: str
     quarterly_data: List[QuarterlyData]
 
-class KeyMetric(BaseModel):
+class KeyMetric(FrozenModel):
     metric: str
     value: str
     growth: str
 
-class DataPoint(BaseModel):
+class DataPoint(FrozenModel):
     date: str
     value: float
 
-class PieDataPoint(BaseModel):
+class PieDataPoint(FrozenModel):
     name: str
     value: int
 
-class Chart(BaseModel):
+class Chart(FrozenModel):
     title: str
     type: str
     x_axis: Optional[str] = None
     y_axis: Optional[str] = None
     data_points: List[Union[DataPoint, PieDataPoint]]
 
-class ChartData(BaseModel):
+class ChartData(FrozenModel):
     user_growth_chart: Chart
     revenue_growth_chart: Chart
     market_comparison_chart: Chart
 
-class GrowthMetrics(BaseModel):
+class GrowthMetrics(FrozenModel):
     user_growth: UserGrowth
     revenue_growth: RevenueGrowth
     key_metrics: List[KeyMetric]
     chart_data: ChartData
 
 # Competitive Landscape Models
-class Competitor(BaseModel):
+class Competitor(FrozenModel):
     name: str
     description: str
     funding: str
     strengths: List[str]
     weaknesses: List[str]
 
-class IndirectCompetitor(BaseModel):
+class IndirectCompetitor(FrozenModel):
     name: str
     description: str
     funding: str
 
-class CompanyComparison(BaseModel):
+class CompanyComparison(FrozenModel):
     name: str
     values: List[str]
 
-class ComparisonChart(BaseModel):
+class ComparisonChart(FrozenModel):
     title: str
     categories: List[str]
     companies: List[CompanyComparison]
 
-class CompetitiveLandscape(BaseModel):
+class CompetitiveLandscape(FrozenModel):
     direct_competitors: List[Competitor]
     indirect_competitors: List[IndirectCompetitor]
     competitive_advantage: str
     comparison_chart: ComparisonChart
 
 # Team Analysis Models
-class Person(BaseModel):
+class Person(FrozenModel):
     name: str
     role: str
     background: str
     linkedin: Optional[str] = None
 
-class BoardMember(BaseModel):
+class BoardMember(FrozenModel):
     name: str
     role: str
     organization: str
     background: str
 
-class Advisor(BaseModel):
+class Advisor(FrozenModel):
     name: str
     role: str
     background: str
 
-class TeamAnalysis(BaseModel):
+class TeamAnalysis(FrozenModel):
     key_people: List[Person]
     board_members: List[BoardMember]
     advisors: List[Advisor]
     team_strength: str
 
 # Product Analysis Models
-class Feature(BaseModel):
+class Feature(FrozenModel):
     feature: str
     description: str
 
-class Screenshot(BaseModel):
+class Screenshot(FrozenModel):
     title: str
     url: str
     description: str
 
-class ProductAnalysis(BaseModel):
+class ProductAnalysis(FrozenModel):
     product_description: str
     key_features: List[Feature]
     technology_stack: List[str]
@@ -199,18 +203,18 @@ class ProductAnalysis(BaseModel):
     product_screenshots: List[Screenshot]
 
 # Customer Analysis Models
-class Client(BaseModel):
+class Client(FrozenModel):
     name: str
     industry: str
     description: str
 
-class CaseStudy(BaseModel):
+class CaseStudy(FrozenModel):
     title: str
     client: str
     description: str
     results: str
 
-class CustomerAnalysis(BaseModel):
+class CustomerAnalysis(FrozenModel):
     target_customers: str
     customer_demographics: str
     major_clients: List[Client]
@@ -219,25 +223,25 @@ class CustomerAnalysis(BaseModel):
     customer_retention: str
 
 # Risk Assessment Models
-class Risk(BaseModel):
+class Risk(FrozenModel):
     risk: str
     description: str
     mitigation: str
 
-class RiskAssessment(BaseModel):
+class RiskAssessment(FrozenModel):
     market_risks: List[Risk]
     competitive_risks: List[Risk]
     financial_risks: List[Risk]
     regulatory_risks: List[Risk]
 
 # Investment Analysis Models
-class ExitStrategy(BaseModel):
+class ExitStrategy(FrozenModel):
     strategy: str
     description: str
     potential_acquirers: Optional[List[str]] = None
     timeline: Optional[str] = None
 
-class ComparableExit(BaseModel):
+class ComparableExit(FrozenModel):
     company: str
     exit_type: str
     date: str
@@ -245,7 +249,7 @@ class ComparableExit(BaseModel):
     acquirer: str
     multiple: str
 
-class InvestmentAnalysis(BaseModel):
+class InvestmentAnalysis(FrozenModel):
     investment_thesis: str
     potential_exit_strategies: List[ExitStrategy]
     comparable_exits: List[ComparableExit]
@@ -254,43 +258,43 @@ class InvestmentAnalysis(BaseModel):
     investment_concerns: List[str]
 
 # Media and News Models
-class News(BaseModel):
+class News(FrozenModel):
     title: str
     source: str
     date: str
     url: str
     summary: str
 
-class PressRelease(BaseModel):
+class PressRelease(FrozenModel):
     title: str
     date: str
     url: str
     summary: str
 
-class SocialMedia(BaseModel):
+class SocialMedia(FrozenModel):
     twitter: Optional[str] = None
     linkedin: Optional[str] = None
     facebook: Optional[str] = None
     instagram: Optional[str] = None
 
-class MediaAndNews(BaseModel):
+class MediaAndNews(FrozenModel):
     recent_news: List[News]
     social_media: SocialMedia
     press_releases: List[PressRelease]
 
 # Research Metadata Models
-class Source(BaseModel):
+class Source(FrozenModel):
     name: str
     url: str
 
-class ResearchMetadata(BaseModel):
+class ResearchMetadata(FrozenModel):
     research_date: str
     analyst: str
     sources: List[Source]
     last_updated: str
 
 # Complete Research Output Model
-class ResearchOutput(BaseModel):
+class ResearchOutput(FrozenModel):
     company_info: CompanyInfo
     market_analysis: MarketAnalysis
     financial_metrics: FinancialMetrics
@@ -303,3 +307,11 @@ class ResearchOutput(BaseModel):
     investment_analysis: InvestmentAnalysis
     media_and_news: MediaAndNews
     research_metadata: ResearchMetadata
+
+# Dumped Section Types
+# Shape of the dictionary the research metadata tool returns
+class ResearchMetadataDict(TypedDict):
+    research_date: str
+    analyst: str
+    sources: List[Dict[str, str]]
+    last_updated: str
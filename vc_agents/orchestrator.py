@@ -5,32 +5,105 @@ This module implements a research orchestration system using the OpenAI Agentic
 It coordinates specialized agents for different aspects of startup research.
 """
 
-from typing import Dict, Any, List, Optional, Union
-import json
+from typing import Dict, Any, AsyncIterator, Optional, Tuple
 import asyncio
-from datetime import datetime
-from pydantic import BaseModel, Field
+import functools
+import logging
+import os
+from datetime import date
+from pydantic import BaseModel, TypeAdapter
 
-from agents import Agent, Runner, ModelSettings, function_tool, handoff
-from vc_agents.prompts import RESEARCH_AGENT_INSTRUCTIONS, RESEARCH_OUTPUT_SCHEMA
-from vc_agents.models import ResearchOutput
+from agents import Agent, ModelSettings
+from vc_agents.models import (
+    ResearchOutput, CompanyInfo, MarketAnalysis, FinancialMetrics, GrowthMetrics,
+    CompetitiveLandscape, TeamAnalysis, ProductAnalysis, CustomerAnalysis,
+    RiskAssessment, InvestmentAnalysis, MediaAndNews
+)
+from vc_agents.prompts import BASE_INSTRUCTIONS, output_schema
+from vc_agents.runtime import run_agent, as_completed_results
+from vc_agents.cache import normalize_company_name
 
 # Import specialized agents
-from vc_agents.agents.company_agent import company_overview_agent, get_company_overview
-from vc_agents.agents.people_agent import key_people_agent, get_team_analysis
-from vc_agents.agents.market_agent import market_analysis_agent, get_market_analysis
-from vc_agents.agents.competitor_agent import competitor_analysis_agent, get_competitor_analysis
+from vc_agents.agents.company_agent import company_overview_agent
+from vc_agents.agents.people_agent import key_people_agent
+from vc_agents.agents.market_agent import market_analysis_agent, run_market_agent
+from vc_agents.agents.competitor_agent import competitor_analysis_agent
 from vc_agents.agents.metrics_agent import (
-    growth_metrics_agent, get_growth_metrics,
-    financial_metrics_agent, get_financial_metrics,
-    product_analysis_agent, get_product_analysis,
-    customer_analysis_agent, get_customer_analysis,
-    risk_assessment_agent, get_risk_assessment,
-    investment_analysis_agent, get_investment_analysis,
-    media_news_agent, get_media_news,
-    research_metadata_agent, get_research_metadata
+    growth_metrics_agent,
+    financial_metrics_agent,
+    product_analysis_agent,
+    customer_analysis_agent,
+    risk_assessment_agent,
+    investment_analysis_agent,
+    media_news_agent,
+    build_research_metadata
+)
+from vc_agents.tools import track_scraped_sources, search_google, scrape_website, batch_scrape_websites, run_python_code
+
+# Research sections as (output key, agent, output type, input template, phase), in output order
+RESEARCH_SECTIONS = (
+    ("company_info", company_overview_agent, CompanyInfo, "Research basic information about the company: {company_name}", "Researching company overview"),
+    ("market_analysis", market_analysis_agent, MarketAnalysis, "Research the market size (TAM, SAM, and SOM) and market trends for: {company_name}", "Analyzing market size (TAM/SAM)"),
+    ("financial_metrics", financial_metrics_agent, FinancialMetrics, "Research the financial metrics for: {company_name}", "Analyzing financial metrics"),
+    ("growth_metrics", growth_metrics_agent, GrowthMetrics, "Research the growth metrics for: {company_name}", "Researching growth metrics"),
+    ("competitive_landscape", competitor_analysis_agent, CompetitiveLandscape, "Research the competitors and competitive landscape for: {company_name}", "Mapping competitive landscape"),
+    ("team_analysis", key_people_agent, TeamAnalysis, "Research the team (founders, executives, board members, and advisors) of: {company_name}", "Analyzing key people"),
+    ("product_analysis", product_analysis_agent, ProductAnalysis, "Research the product(s) of: {company_name}", "Analyzing product"),
+    ("customer_analysis", customer_analysis_agent, CustomerAnalysis, "Research the customers and clients of: {company_name}", "Analyzing customers"),
+    ("risk_assessment", risk_assessment_agent, RiskAssessment, "Research the risks for: {company_name}", "Assessing risks"),
+    ("investment_analysis", investment_analysis_agent, InvestmentAnalysis, "Research the investment potential of: {company_name}", "Analyzing investment potential"),
+    ("media_and_news", media_news_agent, MediaAndNews, "Research the media coverage and news for: {company_name}", "Gathering media and news")
 )
 
+# Sections run by their agent module's own runner instead of run_agent; each
+# takes the input and an optional on_partial(field, value) preview callback
+_SECTION_RUNNERS = {
+    "market_analysis": run_market_agent
+}
+
+# Turn budget for the single-call research agent, which covers every section in one run
+SINGLE_CALL_MAX_TURNS = int(os.getenv("SINGLE_CALL_MAX_TURNS", "40"))
+
+_SINGLE_CALL_INSTRUCTIONS = """
+You are a VC Research Agent producing a complete research report on a startup in a single run.
+
+The report has one section per heading below. The guidance under each heading is what the specialist agent for that section normally follows. Where it mentions other agents or handoffs, do that work yourself. Research all sections, sharing searches and scraped pages between them where they overlap.
+
+Return a ResearchOutput object; its schema is enforced through structured output, so follow it rather than any JSON examples in the section guidance. The research_metadata section is filled in by the system; leave it minimal.
+"""
+
+@functools.cache
+def _single_call_agent() -> Agent:
+    """Agent that researches every section in one run, built on first use"""
+    section_guidance = "\n\n".join(
+        f"## {key}\n{agent.instructions.removeprefix(BASE_INSTRUCTIONS)}" for key, agent, *_ in RESEARCH_SECTIONS
+    )
+    return Agent(
+        name="Single Call Research Agent",
+        instructions=BASE_INSTRUCTIONS + _SINGLE_CALL_INSTRUCTIONS + "\n" + section_guidance,
+        tools=[search_google, scrape_website, batch_scrape_websites, run_python_code],
+        model="gpt-4o",
+        model_settings=ModelSettings(
+            temperature=0.2
+        ),
+        output_type=output_schema(ResearchOutput)
+    )
+
+# Report keys in output order, and the phase announced for each section
+_REPORT_KEYS = tuple(key for key, *_ in RESEARCH_SECTIONS) + ("research_metadata",)
+_SECTION_PHASES = {key: phase for key, *_, phase in RESEARCH_SECTIONS}
+
+# Skip revalidating the assembled report (the default); set VC_FAST_MODE=0 in
+# development to validate every report against ResearchOutput
+FAST_MODE = os.getenv("VC_FAST_MODE", "1").lower() not in ("0", "false", "no")
+
+# Validator and serializer for the full report, built once
+_OUTPUT_ADAPTER = TypeAdapter(ResearchOutput)
+
+# Sections one research call runs at once
+RESEARCH_MAX_CONCURRENCY = int(os.getenv("VC_MAX_CONCURRENCY", "6"))
+
+logger = logging.getLogger(__name__)
 
 class ResearchOrchestrator:
     """
@@ -38,165 +111,184 @@ class ResearchOrchestrator:
     of startup research.
     """
     
-    def __init__(self, model: str = "gpt-4o"):
+    def __init__(self, model: str = "gpt-4o", max_concurrency: int = RESEARCH_MAX_CONCURRENCY):
         """
         Initialize the research orchestrator.
         
         Args:
             model: The model to use for the main orchestrator agent
+            max_concurrency: Maximum number of sections one research call runs at once
         """
         self.model = model
+        self.max_concurrency = max(1, max_concurrency)
     
-    async def research_startup(self, company_name: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    async def stream_research_startup(
+        self,
+        company_name: str,
+        progress: Optional[asyncio.Queue] = None
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Research all sections of a startup concurrently, yielding each as it finishes.
+        
+        Args:
+            company_name: The name of the startup to research
+            progress: Optional queue that receives a partial message for each field
+                a section previews before it finishes (currently market_analysis)
+            
+        Yields:
+            (section key, section) in completion order. Sections are typed models;
+            a failed section is an empty dict. research_metadata comes last.
+        """
+        # Normalize once, so every section prompt and log line uses the same spelling;
+        # these runs go through run_agent directly and do not use the agent cache
+        company_name = normalize_company_name(company_name)
+        
+        # Date the research once, when it starts, and collect the pages the
+        # agents scrape for the research metadata
+        research_date = date.today().isoformat()
+        sources = track_scraped_sources()
+        
+        # Per-call cap, so one research request cannot take every slot of the
+        # process-wide agent limit while other requests wait
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def run_section(key: str, agent: Agent, output_type: type, input_template: str, phase: str) -> Tuple[str, Any]:
+            async with semaphore:
+                logger.info(f"{phase}...")
+                try:
+                    input = input_template.format(company_name=company_name)
+                    runner = _SECTION_RUNNERS.get(key)
+                    if runner is None:
+                        result = await run_agent(agent, input)
+                    elif progress is None:
+                        result = await runner(input)
+                    else:
+                        result = await runner(input, on_partial=lambda field, value: progress.put_nowait({
+                            "type": "partial",
+                            "section": key,
+                            "field": field,
+                            "data": value
+                        }))
+                    # Fail the section if the agent did not produce its output type
+                    return key, result.final_output_as(output_type, raise_if_incorrect_type=True)
+                except Exception as e:
+                    # One failing section does not stop the others
+                    logger.error(f"Section {key} failed for {company_name}: {e}")
+                    return key, {}
+        
+        # Sections still running are cancelled if the consumer stops early
+        async for section in as_completed_results(run_section(*section) for section in RESEARCH_SECTIONS):
+            yield section
+        
+        yield "research_metadata", build_research_metadata(sources, research_date)
+    
+    async def research_startup(
+        self,
+        company_name: str,
+        params: Optional[Dict[str, Any]] = None,
+        progress: Optional[asyncio.Queue] = None,
+        validate: Optional[bool] = None
+    ) -> Dict[str, Any]:
         """
         Perform comprehensive research on a startup.
         
+        The specialist agents are independent of each other, so all sections
+        are researched concurrently (see stream_research_startup).
+        
         Args:
             company_name: The name of the startup to research
             params: Optional parameters to customize the research
+            progress: Optional queue that receives a progress message as each section
+                finishes, and partial field previews while sections run
+            validate: Re-validate the combined report against ResearchOutput instead of
+                trusting the per-section validation done by the SDK; defaults to
+                off unless VC_FAST_MODE is disabled
             
         Returns:
             A dictionary containing the research results
         """
         try:
-            print(f"Starting research on {company_name}...")
-            
-            # Step 1: Get company overview
-            print("Step 1: Getting company overview...")
-            from vc_agents.agents.company_agent import company_overview_agent
-            company_result = await Runner.run(
-                company_overview_agent,
-                input=f"Research basic information about the company: {company_name}"
-            )
-            company_data = company_result.final_output_as(dict)
+            logger.info(f"Starting research on {company_name}...")
             
-            # Step 2: Get team analysis
-            print("Step 2: Researching team analysis...")
-            from vc_agents.agents.people_agent import key_people_agent
-            team_result = await Runner.run(
-                key_people_agent,
-                input=f"Research the team (founders, executives, board members, and advisors) of: {company_name}"
-            )
-            team_data = team_result.final_output_as(dict)
+            # Preallocate the keys so sections land in the usual order whatever order they finish in
+            combined_data = dict.fromkeys(_REPORT_KEYS)
+            async for key, data in self.stream_research_startup(company_name, progress):
+                combined_data[key] = data
+                phase = _SECTION_PHASES.get(key)
+                if progress is not None and phase is not None:
+                    progress.put_nowait({
+                        "type": "progress",
+                        "message": f"{'Finished' if isinstance(data, BaseModel) else 'Failed'}: {phase}"
+                    })
             
-            # Step 3: Get market analysis
-            print("Step 3: Analyzing market size...")
-            from vc_agents.agents.market_agent import market_analysis_agent
-            market_result = await Runner.run(
-                market_analysis_agent,
-                input=f"Research the market size (TAM, SAM, and SOM) and market trends for: {company_name}"
-            )
-            market_data = market_result.final_output_as(dict)
+            def dump_report() -> Dict[str, Any]:
+                # Sections are typed models checked by the SDK against their output type,
+                # so the report is assembled without a second pass over the whole tree
+                report = ResearchOutput.model_construct(**{
+                    key: data for key, data in combined_data.items() if isinstance(data, BaseModel)
+                })
+                dumped = report.model_dump(mode="json", exclude_none=True)
+                return {key: dumped.get(key, data) for key, data in combined_data.items()}
             
-            # Step 4: Get financial metrics
-            print("Step 4: Analyzing financial metrics...")
-            from vc_agents.agents.metrics_agent import financial_metrics_agent
-            financial_result = await Runner.run(
-                financial_metrics_agent,
-                input=f"Research the financial metrics for: {company_name}"
-            )
-            financial_data = financial_result.final_output_as(dict)
+            if validate is None:
+                validate = not FAST_MODE
+            if not validate:
+                return await asyncio.to_thread(dump_report)
             
-            # Step 5: Get growth metrics
-            print("Step 5: Researching growth metrics...")
-            from vc_agents.agents.metrics_agent import growth_metrics_agent
-            growth_result = await Runner.run(
-                growth_metrics_agent,
-                input=f"Research the growth metrics for: {company_name}"
-            )
-            growth_data = growth_result.final_output_as(dict)
-            
-            # Step 6: Get competitive landscape
-            print("Step 6: Mapping competitive landscape...")
-            from vc_agents.agents.competitor_agent import competitor_analysis_agent
-            competitor_result = await Runner.run(
-                competitor_analysis_agent,
-                input=f"Research the competitors and competitive landscape for: {company_name}"
-            )
-            competitor_data = competitor_result.final_output_as(dict)
-            
-            # Step 7: Get product analysis
-            print("Step 7: Analyzing product...")
-            from vc_agents.agents.metrics_agent import product_analysis_agent
-            product_result = await Runner.run(
-                product_analysis_agent,
-                input=f"Research the product(s) of: {company_name}"
-            )
-            product_data = product_result.final_output_as(dict)
-            
-            # Step 8: Get customer analysis
-            print("Step 8: Analyzing customers...")
-            from vc_agents.agents.metrics_agent import customer_analysis_agent
-            customer_result = await Runner.run(
-                customer_analysis_agent,
-                input=f"Research the customers and clients of: {company_name}"
-            )
-            customer_data = customer_result.final_output_as(dict)
-            
-            # Step 9: Get risk assessment
-            print("Step 9: Assessing risks...")
-            from vc_agents.agents.metrics_agent import risk_assessment_agent
-            risk_result = await Runner.run(
-                risk_assessment_agent,
-                input=f"Research the risks for: {company_name}"
-            )
-            risk_data = risk_result.final_output_as(dict)
-            
-            # Step 10: Get investment analysis
-            print("Step 10: Analyzing investment potential...")
-            from vc_agents.agents.metrics_agent import investment_analysis_agent
-            investment_result = await Runner.run(
-                investment_analysis_agent,
-                input=f"Research the investment potential of: {company_name}"
-            )
-            investment_data = investment_result.final_output_as(dict)
-            
-            # Step 11: Get media and news
-            print("Step 11: Gathering media and news...")
-            from vc_agents.agents.metrics_agent import media_news_agent
-            media_result = await Runner.run(
-                media_news_agent,
-                input=f"Research the media coverage and news for: {company_name}"
-            )
-            media_data = media_result.final_output_as(dict)
-            
-            # Step 12: Get research metadata
-            print("Step 12: Creating research metadata...")
-            from vc_agents.agents.metrics_agent import research_metadata_agent
-            metadata_result = await Runner.run(
-                research_metadata_agent,
-                input=f"Create research metadata for: {company_name}"
-            )
-            metadata_data = metadata_result.final_output_as(dict)
-            
-            # Combine all results into a single output
-            combined_data = {
-                "company_info": company_data,
-                "market_analysis": market_data,
-                "financial_metrics": financial_data,
-                "growth_metrics": growth_data,
-                "competitive_landscape": competitor_data,
-                "team_analysis": team_data,
-                "product_analysis": product_data,
-                "customer_analysis": customer_data,
-                "risk_assessment": risk_data,
-                "investment_analysis": investment_data,
-                "media_and_news": media_data,
-                "research_metadata": metadata_data
-            }
-            
-            # Validate the combined data
+            # Validate the combined data in a worker thread; the full report is
+            # large enough that validating it would stall other requests
             try:
-                validated_data = ResearchOutput(**combined_data)
-                return validated_data.model_dump()
+                return await asyncio.to_thread(
+                    lambda: _OUTPUT_ADAPTER.dump_python(_OUTPUT_ADAPTER.validate_python(combined_data), mode="json", exclude_none=True)
+                )
             except Exception as e:
-                print(f"Warning: Validation error: {str(e)}")
+                logger.warning(f"Validation error: {str(e)}")
                 # Return the data anyway, even if it doesn't fully validate
-                return combined_data
+                return await asyncio.to_thread(dump_report)
             
         except Exception as e:
             # Catch any errors during the research process
-            print(f"Error during research: {str(e)}")
+            logger.exception(f"Error during research: {str(e)}")
             return {
                 "error": f"Error during research: {str(e)}"
             }
+    
+    async def research_startup_single_call(
+        self,
+        company_name: str,
+        params: Optional[Dict[str, Any]] = None,
+        progress: Optional[asyncio.Queue] = None
+    ) -> Dict[str, Any]:
+        """
+        Research a startup with one agent run covering every section.
+        
+        The specialist instructions share one prompt, so the prefix is paid
+        once instead of per section. If the run fails or its output does not
+        validate as ResearchOutput, this falls back to research_startup.
+        
+        Args:
+            company_name: The name of the startup to research
+            params: Optional parameters to customize the research
+            progress: Optional queue for progress messages, used by the fallback
+            
+        Returns:
+            A dictionary containing the research results
+        """
+        company_name = normalize_company_name(company_name)
+        
+        try:
+            logger.info(f"Starting single-call research on {company_name}...")
+            research_date = date.today().isoformat()
+            sources = track_scraped_sources()
+            result = await run_agent(
+                _single_call_agent(),
+                f"Research the startup: {company_name}",
+                max_turns=SINGLE_CALL_MAX_TURNS
+            )
+            report = result.final_output_as(ResearchOutput, raise_if_incorrect_type=True)
+            dumped = await asyncio.to_thread(report.model_dump, mode="json", exclude_none=True)
+            dumped["research_metadata"] = build_research_metadata(sources, research_date)
+            return dumped
+        except Exception as e:
+            logger.warning(f"Single-call research failed for {company_name}, falling back to per-section agents: {str(e)}")
+            return await self.research_startup(company_name, params, progress)
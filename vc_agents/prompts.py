@@ -1,6 +1,31 @@
 # Agent instructions and output schemas
 from typing import Dict, Any, List, Optional, Union
+from importlib.resources import files
+import functools
+import orjson
+import sys
+from pathlib import Path
 from pydantic import BaseModel, Field
+from agents import AgentOutputSchema
+
+@functools.lru_cache(maxsize=None)
+def load_prompt(name: str) -> str:
+    """
+    Read agent instructions from vc_agents/prompts/<name>.txt, once per process.
+    
+    If vc_agents/prompts/<name>.example.json exists, it is minified and put in
+    place of {output_example}, so the example costs as few tokens as possible.
+    """
+    prompts = files("vc_agents").joinpath("prompts")
+    text = prompts.joinpath(f"{name}.txt").read_text(encoding="utf-8")
+    example = prompts.joinpath(f"{name}.example.json")
+    if example.is_file():
+        text = text.replace("{output_example}", orjson.dumps(orjson.loads(example.read_bytes())).decode())
+    return sys.intern(text)
+
+# Shared opening of every specialist agent's instructions; keeping it byte-identical
+# lets the provider reuse the cached prompt prefix across agents
+BASE_INSTRUCTIONS = load_prompt("_base")
 
 RESEARCH_AGENT_INSTRUCTIONS = """
 You are an expert VC Research Agent specialized in gathering comprehensive information about startups for venture capital analysis. Your research will be used by VC analysts to make investment decisions.
@@ -159,7 +184,39 @@ Ensure all fields are properly researched and filled with accurate information.
 """
 
 # Import the ResearchOutput model to generate the schema
+from vc_agents import models
 from vc_agents.models import ResearchOutput
 
-# Generate the schema from the ResearchOutput model
-RESEARCH_OUTPUT_SCHEMA = ResearchOutput.model_json_schema()
+# Generated schema cached next to this module; regenerated when models.py is newer
+_SCHEMA_CACHE_PATH = Path(__file__).with_name("_research_schema.json")
+
+def _load_research_output_schema() -> Dict[str, Any]:
+    """Load the ResearchOutput JSON schema from the on-disk cache, regenerating it if stale"""
+    models_path = Path(models.__file__)
+    try:
+        if _SCHEMA_CACHE_PATH.stat().st_mtime > models_path.stat().st_mtime:
+            return orjson.loads(_SCHEMA_CACHE_PATH.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        pass
+    
+    # Generate the schema from the ResearchOutput model
+    schema = ResearchOutput.model_json_schema()
+    try:
+        _SCHEMA_CACHE_PATH.write_bytes(orjson.dumps(schema))
+    except OSError:
+        # Read-only installs just regenerate on every start
+        pass
+    return schema
+
+RESEARCH_OUTPUT_SCHEMA = _load_research_output_schema()
+
+@functools.lru_cache(maxsize=None)
+def output_schema(output_type: type) -> AgentOutputSchema:
+    """
+    Strict structured-output schema for an agent output type, built once per type.
+    
+    The SDK sends this schema as the response_format, so the model's decoding is
+    constrained to valid output. Passing a prebuilt schema as an agent's
+    output_type stops the SDK from regenerating it on every run.
+    """
+    return AgentOutputSchema(output_type)
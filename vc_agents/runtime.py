@@ -0,0 +1,172 @@
+"""
+Agent Runtime for VC Research Engine
+
+This module runs agents under a process-wide concurrency cap and retries runs
+that hit OpenAI rate limits with exponential backoff. With every section
+researched in parallel, many gpt-4o runs start at once; the cap keeps bursts
+under the account's RPM/TPM limits and the backoff rides out the 429s that
+still get through instead of failing the whole research run.
+"""
+
+import asyncio
+import logging
+import os
+import random
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, Iterable, Optional, TypeVar
+
+from openai import RateLimitError
+from agents import Agent, Runner, RunResult, RunResultStreaming, StreamEvent
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Maximum number of agent runs in flight at once across the process
+MAX_CONCURRENT_AGENTS = int(os.getenv("MAX_CONCURRENT_AGENTS", "8"))
+
+# Attempts per run and the longest wait between them, in seconds
+AGENT_MAX_ATTEMPTS = int(os.getenv("AGENT_MAX_ATTEMPTS", "5"))
+AGENT_MAX_BACKOFF = float(os.getenv("AGENT_MAX_BACKOFF_SECONDS", "60"))
+
+_agent_semaphore = asyncio.Semaphore(MAX_CONCURRENT_AGENTS)
+
+# Semaphores shared by the tool calls of the current agent run; run_agent starts
+# an empty dict per run, and the Runner's tool tasks inherit it via the context
+_run_semaphores: ContextVar[Optional[Dict[Hashable, asyncio.Semaphore]]] = ContextVar("run_semaphores", default=None)
+
+def run_semaphore(key: Hashable, limit: int) -> asyncio.Semaphore:
+    """
+    Return the semaphore for key shared by the tool calls of the current agent run.
+    
+    Outside run_agent there is no run to share with, so each call gets its own.
+    
+    Args:
+        key: Identifies the group of tools sharing the limit
+        limit: Size of the semaphore when this run creates it
+        
+    Returns:
+        The semaphore for key in the current run
+    """
+    semaphores = _run_semaphores.get()
+    if semaphores is None:
+        return asyncio.Semaphore(limit)
+    semaphore = semaphores.get(key)
+    if semaphore is None:
+        semaphore = semaphores[key] = asyncio.Semaphore(limit)
+    return semaphore
+
+def _retry_delay(error: RateLimitError, attempt: int) -> float:
+    """Seconds to wait before the next attempt, preferring the server's Retry-After"""
+    headers = error.response.headers
+    try:
+        if "retry-after-ms" in headers:
+            return min(AGENT_MAX_BACKOFF, float(headers["retry-after-ms"]) / 1000)
+        if "retry-after" in headers:
+            return min(AGENT_MAX_BACKOFF, float(headers["retry-after"]))
+    except ValueError:
+        # Retry-After may also be an HTTP date; fall back to exponential backoff
+        pass
+    return min(AGENT_MAX_BACKOFF, 2 ** attempt) * random.uniform(0.5, 1.0)
+
+async def run_agent(agent: Agent, input: Any, **kwargs: Any) -> RunResult:
+    """
+    Run an agent like Runner.run, within the concurrency cap and with rate limit retries.
+
+    Args:
+        agent: The agent to run
+        input: The agent input
+        **kwargs: Passed through to Runner.run
+
+    Returns:
+        The run result
+    """
+    token = _run_semaphores.set({})
+    try:
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                async with _agent_semaphore:
+                    return await Runner.run(agent, input=input, **kwargs)
+            except RateLimitError as e:
+                # An exhausted quota will not recover by waiting
+                if e.code == "insufficient_quota" or attempt >= AGENT_MAX_ATTEMPTS:
+                    raise
+                delay = _retry_delay(e, attempt)
+                logger.warning(f"{agent.name} hit a rate limit, retrying in {delay:.1f}s (attempt {attempt}/{AGENT_MAX_ATTEMPTS})")
+                # Wait outside the semaphore so other runs can proceed meanwhile
+                await asyncio.sleep(delay)
+    finally:
+        _run_semaphores.reset(token)
+
+async def run_agent_streamed(
+    agent: Agent,
+    input: Any,
+    on_event: Callable[[StreamEvent], None],
+    **kwargs: Any
+) -> RunResultStreaming:
+    """
+    Run an agent like Runner.run_streamed, within the concurrency cap and with rate limit retries.
+    
+    Every stream event is passed to on_event as it arrives. A rate limit is only
+    retried before the first model response event; once on_event has seen model
+    output, retrying would replay it, so the error is raised instead.
+    
+    Args:
+        agent: The agent to run
+        input: The agent input
+        on_event: Called with each stream event
+        **kwargs: Passed through to Runner.run_streamed
+        
+    Returns:
+        The completed run result
+    """
+    # Set before run_streamed, whose run task copies the context when it starts
+    token = _run_semaphores.set({})
+    try:
+        attempt = 0
+        while True:
+            attempt += 1
+            streamed_output = False
+            try:
+                async with _agent_semaphore:
+                    result = Runner.run_streamed(agent, input=input, **kwargs)
+                    try:
+                        async for event in result.stream_events():
+                            streamed_output = streamed_output or event.type == "raw_response_event"
+                            on_event(event)
+                    finally:
+                        if not result.is_complete:
+                            result.cancel()
+                    return result
+            except RateLimitError as e:
+                if streamed_output or e.code == "insufficient_quota" or attempt >= AGENT_MAX_ATTEMPTS:
+                    raise
+                delay = _retry_delay(e, attempt)
+                logger.warning(f"{agent.name} hit a rate limit, retrying in {delay:.1f}s (attempt {attempt}/{AGENT_MAX_ATTEMPTS})")
+                await asyncio.sleep(delay)
+    finally:
+        _run_semaphores.reset(token)
+
+async def as_completed_results(awaitables: Iterable[Awaitable[T]]) -> AsyncIterator[T]:
+    """
+    Run awaitables concurrently and yield their results in completion order.
+    
+    If the consumer stops early, the tasks still running are cancelled. Work
+    they await through asyncio.shield, such as AsyncTTLCache entries, is not
+    cancelled; it finishes and stays cached for later callers.
+    
+    Args:
+        awaitables: The coroutines or futures to run
+        
+    Yields:
+        Each result as soon as it is ready
+    """
+    tasks = [asyncio.ensure_future(awaitable) for awaitable in awaitables]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -2,13 +2,234 @@
 from agents import function_tool
 from services.search_service import SearchService
 from services.scraping_service import ScrapingService
-from typing import Dict, Any, List, Optional
+from vc_agents.cache import AsyncTTLCache
+from vc_agents.runtime import run_semaphore
+from typing import Dict, Any, Callable, List, Optional, Tuple
+import asyncio
+import dataclasses
 import logging
 import os
-from e2b_code_interpreter import Sandbox
+import orjson
+from contextvars import ContextVar
+from urllib.parse import urlsplit, urlunsplit
+from e2b_code_interpreter import AsyncSandbox
 
-# Set up logging
+# Set up logging, with a child logger per tool so each can be tuned separately
 logger = logging.getLogger(__name__)
+_search_logger = logger.getChild("search_google")
+_scrape_logger = logger.getChild("scrape_website")
+_code_logger = logger.getChild("run_python_code")
+
+# Maximum number of tool calls one agent run executes at once
+TOOL_CONCURRENCY_LIMIT = int(os.getenv("TOOL_CONCURRENCY_LIMIT", "5"))
+
+# Search and scrape results shared across agents and runs, keyed on the normalized
+# query or URL so overlapping calls from different agents hit the same entry.
+# Search rankings change faster than page content, so they expire sooner
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_TTL_SEC", "600"))
+SCRAPE_CACHE_TTL = float(os.getenv("SCRAPE_TTL_SEC", "3600"))
+_search_cache = AsyncTTLCache(ttl=SEARCH_CACHE_TTL, maxsize=512)
+_scrape_cache = AsyncTTLCache(ttl=SCRAPE_CACHE_TTL, maxsize=512)
+
+# Scraped pages already formatted for agents, keyed on (url, focus) so repeat
+# calls skip formatting; aliased focus areas still share one raw scrape above
+_page_cache = AsyncTTLCache(ttl=SCRAPE_CACHE_TTL, maxsize=256)
+
+# Pages fetched at once by one batch_scrape_websites call, and the separator between them
+SCRAPE_BATCH_CONCURRENCY = int(os.getenv("SCRAPE_BATCH_CONCURRENCY", "10"))
+BATCH_SCRAPE_SEPARATOR = "\n\n==========\n\n"
+
+# Longest text a scrape or code run hands back to the model; longer outputs
+# keep their start and end and lose the middle
+TOOL_MAX_CHARS = int(os.getenv("TOOL_MAX_CHARS", "16000"))
+
+# CSS selectors scraped for each focus area, and the other names agents use for
+# those areas. Unknown focus values scrape only the main content
+_FOCUS_SELECTORS: Dict[str, Dict[str, str]] = {
+    "team": {
+        "team": ".team, .people, .leadership, .executives, [class*='team'], [class*='people']",
+        "leadership": ".leadership, .executives, .management, [class*='leadership']"
+    },
+    "investors": {
+        "investors": ".investors, .funding, .backers, [class*='investor'], [class*='funding']"
+    },
+    "about": {
+        "about": ".about, #about, [class*='about'], .company-info, #company-info"
+    }
+}
+_FOCUS_ALIASES = {"people": "team", "funding": "investors"}
+
+# Heading for each selector's content in a formatted page
+_SELECTOR_LABELS = {key: key.capitalize() for selectors in _FOCUS_SELECTORS.values() for key in selectors}
+
+# Code runs in flight at once across the process, which also caps how many
+# sandboxes exist so parallel agents stay within the E2B account's limit
+E2B_MAX_CONCURRENT = int(os.getenv("E2B_MAX_CONCURRENT", "4"))
+_sandbox_semaphore = asyncio.Semaphore(E2B_MAX_CONCURRENT)
+
+# Warm E2B sandboxes reused across run_python_code calls, since booting one takes
+# seconds; a sandbox is recycled after SANDBOX_MAX_USES runs to bound leaked state.
+# By default every sandbox allowed to run at once can be kept warm
+SANDBOX_POOL_SIZE = int(os.getenv("SANDBOX_POOL_SIZE", str(E2B_MAX_CONCURRENT)))
+SANDBOX_MAX_USES = int(os.getenv("SANDBOX_MAX_USES", "20"))
+SANDBOX_TIMEOUT = int(os.getenv("SANDBOX_TIMEOUT_SECONDS", "600"))
+_sandbox_pool: "asyncio.Queue[AsyncSandbox]" = asyncio.Queue()
+_sandbox_uses: Dict[str, int] = {}
+
+# Pages scraped during the current research run as normalized URL -> title;
+# tool calls run in tasks that inherit the context, so they all add to the same dict
+_scraped_sources: ContextVar[Optional[Dict[str, str]]] = ContextVar("scraped_sources", default=None)
+
+def track_scraped_sources() -> Dict[str, str]:
+    """
+    Start collecting the pages scraped in the current context.
+    
+    Returns:
+        The dict that successful scrapes are recorded in, as normalized URL -> page title
+    """
+    sources: Dict[str, str] = {}
+    _scraped_sources.set(sources)
+    return sources
+
+def scraped_sources() -> Dict[str, str]:
+    """Return the pages scraped since the last track_scraped_sources call in this context"""
+    return _scraped_sources.get() or {}
+
+def clear_tool_caches() -> None:
+    """Forget all cached search and scrape results"""
+    _search_cache.clear()
+    _scrape_cache.clear()
+    _page_cache.clear()
+
+def _normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of a search query"""
+    return " ".join(query.lower().split())
+
+def _normalize_url(url: str) -> str:
+    """Canonical form of a URL: lowercase scheme and host, no fragment or trailing slash"""
+    parts = urlsplit(url.strip())
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/"), parts.query, ""))
+
+def _is_search_success(results: List[Dict[str, Any]]) -> bool:
+    """SearchService reports failures as a single result titled 'Error' without a link"""
+    return not (len(results) == 1 and results[0]["title"] == "Error" and not results[0]["link"])
+
+def _truncate(text: str, limit: int = TOOL_MAX_CHARS) -> str:
+    """Cut the middle out of text longer than limit, noting how much was dropped"""
+    if len(text) <= limit:
+        return text
+    half = limit // 2
+    return f"{text[:half]}\n...[{len(text) - 2 * half} chars omitted]...\n{text[-half:]}"
+
+def with_concurrency_limit(tools: List[Any], limit: int = TOOL_CONCURRENCY_LIMIT) -> List[Any]:
+    """
+    Return copies of the given function tools that share one concurrency limit per agent run.
+    
+    The Runner already dispatches all tool calls from one model response
+    concurrently; this bounds how many of them run at the same time. Each
+    run started through run_agent gets its own limit, so concurrent runs of
+    the same agent do not queue behind each other.
+    
+    Args:
+        tools: Function tools to wrap
+        limit: Maximum number of concurrent invocations across the tools
+        
+    Returns:
+        The wrapped tools, in the same order
+    """
+    # Identifies this group of tools within a run
+    key = object()
+    
+    def limited(tool):
+        async def on_invoke_tool(ctx, input_json: str):
+            async with run_semaphore(key, limit):
+                return await tool.on_invoke_tool(ctx, input_json)
+        return dataclasses.replace(tool, on_invoke_tool=on_invoke_tool)
+    
+    return [limited(tool) for tool in tools]
+
+def map_tool_output(tool: Any, transform: Callable[[str], str]) -> Any:
+    """
+    Return a copy of a function tool whose string output is passed through transform.
+    
+    Args:
+        tool: Function tool to wrap
+        transform: Applied to the tool output before it reaches the model
+        
+    Returns:
+        The wrapped tool
+    """
+    async def on_invoke_tool(ctx, input_json: str):
+        output = await tool.on_invoke_tool(ctx, input_json)
+        return transform(output) if isinstance(output, str) else output
+    return dataclasses.replace(tool, on_invoke_tool=on_invoke_tool)
+
+def json_output(tool: Any) -> Any:
+    """
+    Return a copy of a function tool that hands dict and list outputs to the model as compact JSON.
+    
+    The SDK sends non-string outputs to the model as their Python repr; this
+    serializes them once with orjson instead.
+    
+    Args:
+        tool: Function tool to wrap
+        
+    Returns:
+        The wrapped tool
+    """
+    async def on_invoke_tool(ctx, input_json: str):
+        output = await tool.on_invoke_tool(ctx, input_json)
+        return orjson.dumps(output).decode() if isinstance(output, (dict, list)) else output
+    return dataclasses.replace(tool, on_invoke_tool=on_invoke_tool)
+
+async def _checkout_sandbox() -> AsyncSandbox:
+    """Take a warm sandbox from the pool, or boot a new one if none is idle"""
+    while True:
+        try:
+            sandbox = _sandbox_pool.get_nowait()
+        except asyncio.QueueEmpty:
+            sandbox = await AsyncSandbox.create(timeout=SANDBOX_TIMEOUT)
+            _sandbox_uses[sandbox.sandbox_id] = 0
+            return sandbox
+        try:
+            # Extend its lifetime; this fails if the sandbox expired while idle
+            await sandbox.set_timeout(SANDBOX_TIMEOUT)
+            return sandbox
+        except Exception:
+            _sandbox_uses.pop(sandbox.sandbox_id, None)
+            _code_logger.warning("Dropping expired sandbox %s", sandbox.sandbox_id)
+
+async def _checkin_sandbox(sandbox: AsyncSandbox) -> None:
+    """Reset a sandbox and return it to the pool, or kill it once it is used up or the pool is full"""
+    uses = _sandbox_uses.get(sandbox.sandbox_id, 0) + 1
+    _sandbox_uses[sandbox.sandbox_id] = uses
+    try:
+        if uses < SANDBOX_MAX_USES and _sandbox_pool.qsize() < SANDBOX_POOL_SIZE:
+            # Clear the previous caller's globals before the next one sees them
+            await sandbox.run_code("%reset -f")
+            # Other sandboxes may have been returned during the reset
+            if _sandbox_pool.qsize() < SANDBOX_POOL_SIZE:
+                _sandbox_pool.put_nowait(sandbox)
+                return
+    except Exception:
+        _code_logger.warning("Could not reset sandbox %s, discarding it", sandbox.sandbox_id)
+    _sandbox_uses.pop(sandbox.sandbox_id, None)
+    await _kill_sandbox(sandbox)
+
+async def _kill_sandbox(sandbox: AsyncSandbox) -> None:
+    try:
+        await sandbox.kill()
+    except Exception:
+        _code_logger.exception("Error killing sandbox %s", sandbox.sandbox_id)
+
+async def close_sandbox_pool() -> None:
+    """Kill the idle pooled sandboxes on shutdown"""
+    while not _sandbox_pool.empty():
+        sandbox = _sandbox_pool.get_nowait()
+        _sandbox_uses.pop(sandbox.sandbox_id, None)
+        await _kill_sandbox(sandbox)
+
+_NO_CODE_OUTPUT = "Code executed successfully with no output."
 
 @function_tool
 async def run_python_code(code: str) -> str:
@@ -21,44 +242,52 @@ async def run_python_code(code: str) -> str:
     Returns:
         The output of the executed code
     """
-    logger.info(f"Tool called: run_python_code")
+    _code_logger.info("Tool called: run_python_code")
     
     try:
-        # Create a sandbox
-        with Sandbox() as sandbox:
-            # Execute the code
-            execution = sandbox.run_code(code)
-            
-            # Prepare the result
-            result = ""
-            
-            # Add any stdout output
-            if execution.logs and execution.logs.stdout:
-                result += f"Output:\n{execution.logs.stdout}\n\n"
-            
-            # Add any stderr output
-            if execution.logs and execution.logs.stderr:
-                result += f"Errors:\n{execution.logs.stderr}\n\n"
-                
-            # Add the text result if available
-            if execution.text:
-                result += f"Result:\n{execution.text}\n\n"
-                
-            # Check for error
-            if execution.error:
-                result += f"Error:\n{execution.error.name}: {execution.error.value}\n"
-                if hasattr(execution.error, 'traceback'):
-                    result += f"Traceback:\n{execution.error.traceback}\n"
+        async with _sandbox_semaphore:
+            sandbox = await _checkout_sandbox()
+            try:
+                # Execute the code
+                execution = await sandbox.run_code(code)
+            finally:
+                await _checkin_sandbox(sandbox)
+        _code_logger.info("Python code execution completed")
+        
+        # Quick snippets often produce nothing at all; skip formatting for them
+        logs = execution.logs
+        if not (execution.results or execution.error or (logs and (logs.stdout or logs.stderr))):
+            return _NO_CODE_OUTPUT
+        
+        # Prepare the result
+        parts = []
+        
+        # Add any stdout and stderr output; the SDK collects each as the list
+        # of chunks streamed during execution, so join them back into text
+        if execution.logs and execution.logs.stdout:
+            parts.append(f"Output:\n{''.join(execution.logs.stdout)}\n\n")
+        
+        if execution.logs and execution.logs.stderr:
+            parts.append(f"Errors:\n{''.join(execution.logs.stderr)}\n\n")
             
-            # If there are any charts or visualizations, mention them
-            if execution.results and any(r.png for r in execution.results):
-                result += "Note: The code generated visualizations that can't be displayed in text format.\n"
+        # Add the text result if available
+        if execution.text:
+            parts.append(f"Result:\n{execution.text}\n\n")
             
-            logger.info("Python code execution completed")
-            return result if result else "Code executed successfully with no output."
+        # Check for error
+        if execution.error:
+            parts.append(f"Error:\n{execution.error.name}: {execution.error.value}\n")
+            if hasattr(execution.error, 'traceback'):
+                parts.append(f"Traceback:\n{execution.error.traceback}\n")
+        
+        # If there are any charts or visualizations, mention them
+        if execution.results and any(r.png for r in execution.results):
+            parts.append("Note: The code generated visualizations that can't be displayed in text format.\n")
+        
+        return _truncate("".join(parts)) if parts else _NO_CODE_OUTPUT
     except Exception as e:
         error_message = f"Error executing Python code: {str(e)}"
-        logger.exception(error_message)
+        _code_logger.exception(error_message)
         return f"Execution error: {error_message}"
 
 @function_tool
@@ -70,88 +299,136 @@ async def search_google(query: str, num_results: int) -> str:
         query: The search query
         num_results: Number of results to return
     """
-    logger.info(f"Tool called: search_google(query='{query}', num_results={num_results})")
+    _search_logger.info("Tool called: search_google(query='%s', num_results=%s)", query, num_results)
     
     try:
-        results = await SearchService.search(query, num_results)
+        results = await _search_cache.get_or_run(
+            (_normalize_query(query), num_results),
+            lambda: SearchService.search(query, num_results),
+            cache_if=_is_search_success
+        )
         
         # Format results for the agent
-        formatted_results = "Search results:\n\n"
+        parts = ["Search results:\n\n"]
         if not results:
-            formatted_results += "No results found.\n"
+            parts.append("No results found.\n")
         else:
             for i, result in enumerate(results, 1):
-                formatted_results += f"{i}. {result['title']}\n"
-                formatted_results += f"   URL: {result['link']}\n"
-                formatted_results += f"   {result['snippet']}\n\n"
+                parts.append(f"{i}. {result['title']}\n   URL: {result['link']}\n   {result['snippet']}\n\n")
         
-        logger.info(f"search_google returned {len(results)} results")
-        return formatted_results
+        _search_logger.info("search_google returned %d results", len(results))
+        return "".join(parts)
     except Exception as e:
         error_message = f"Error performing search for '{query}': {str(e)}"
-        logger.exception(error_message)
+        _search_logger.exception(error_message)
         return f"Search error: {error_message}"
 
-@function_tool
-async def scrape_website(url: str, focus: Optional[str] = None) -> str:
+def _focus_selectors(focus: Optional[str]) -> Optional[Dict[str, str]]:
+    """Selectors for a focus area or one of its aliases, matched case-insensitively"""
+    if not focus:
+        return None
+    focus = focus.strip().lower()
+    return _FOCUS_SELECTORS.get(_FOCUS_ALIASES.get(focus, focus))
+
+async def _format_page(url: str, focus: Optional[str], selectors: Optional[Dict[str, str]]) -> Tuple[Optional[str], str]:
     """
-    Scrape content from a website.
+    Scrape one URL through the raw page cache and format it for an agent.
     
-    Args:
-        url: The URL to scrape
-        focus: Focus area (e.g., "about", "team", "investors")
+    Returns:
+        Tuple of (title, text); title is None and text the error message if the scrape failed
     """
-    logger.info(f"Tool called: scrape_website(url='{url}', focus='{focus}')")
+    result = await _scrape_cache.get_or_run(
+        (_normalize_url(url), selectors and tuple(selectors)),
+        lambda: ScrapingService.scrape_website(url, selectors),
+        cache_if=lambda scraped: "error" not in scraped
+    )
+    
+    if "error" in result:
+        return None, f"Error scraping {url}: {result['error']}"
+    
+    # Format the result for the agent
+    parts = [f"Content from {url}:\n\nTitle: {result['title']}\n\n"]
+    
+    if result.get('description'):
+        parts.append(f"Description: {result['description']}\n\n")
+    
+    if focus and result.get('specific_content'):
+        parts.append(f"--- {focus.upper()} CONTENT ---\n\n")
+        for key, texts in result['specific_content'].items():
+            label = _SELECTOR_LABELS[key]
+            if isinstance(texts, list):
+                parts.append(f"{label}:\n")
+                parts.extend(f"- {text}\n" for text in texts)
+            else:
+                parts.append(f"{label}: {texts}\n")
+        parts.append("\n")
+    
+    parts.append("--- MAIN CONTENT ---\n\n")
+    parts.append(result.get('content', 'No content extracted'))
     
+    return result['title'] or url, _truncate("".join(parts))
+
+async def _scrape_and_format(url: str, focus: Optional[str], selectors: Optional[Dict[str, str]]) -> str:
+    """Return the formatted page for a URL and focus, scraping and formatting it on a cache miss"""
     try:
-        selectors = None
-        if focus:
-            # Define selectors based on focus area
-            if focus == "team" or focus == "people":
-                selectors = {
-                    "team": ".team, .people, .leadership, .executives, [class*='team'], [class*='people']",
-                    "leadership": ".leadership, .executives, .management, [class*='leadership']"
-                }
-            elif focus == "investors" or focus == "funding":
-                selectors = {
-                    "investors": ".investors, .funding, .backers, [class*='investor'], [class*='funding']"
-                }
-            elif focus == "about":
-                selectors = {
-                    "about": ".about, #about, [class*='about'], .company-info, #company-info"
-                }
-        
-        result = await ScrapingService.scrape_website(url, selectors)
-        
-        if "error" in result:
-            error_message = f"Error scraping {url}: {result['error']}"
-            logger.error(error_message)
-            return error_message
+        title, text = await _page_cache.get_or_run(
+            (url, focus),
+            lambda: _format_page(url, focus, selectors),
+            cache_if=lambda page: page[0] is not None
+        )
         
-        # Format the result for the agent
-        formatted_result = f"Content from {url}:\n\n"
-        formatted_result += f"Title: {result['title']}\n\n"
+        if title is None:
+            _scrape_logger.error(text)
+            return text
         
-        if result.get('description'):
-            formatted_result += f"Description: {result['description']}\n\n"
+        sources = _scraped_sources.get()
+        if sources is not None:
+            sources.setdefault(_normalize_url(url), title)
         
-        if focus and result.get('specific_content'):
-            formatted_result += f"--- {focus.upper()} CONTENT ---\n\n"
-            for key, texts in result['specific_content'].items():
-                if isinstance(texts, list):
-                    formatted_result += f"{key.capitalize()}:\n"
-                    for text in texts:
-                        formatted_result += f"- {text}\n"
-                else:
-                    formatted_result += f"{key.capitalize()}: {texts}\n"
-            formatted_result += "\n"
-        
-        formatted_result += "--- MAIN CONTENT ---\n\n"
-        formatted_result += result.get('content', 'No content extracted')
-        
-        logger.info(f"Successfully scraped {url}")
-        return formatted_result
+        _scrape_logger.info("Successfully scraped %s", url)
+        return text
     except Exception as e:
         error_message = f"Error in scrape_website for '{url}': {str(e)}"
-        logger.exception(error_message)
+        _scrape_logger.exception(error_message)
         return f"Scraping error: {error_message}"
+
+async def _scrape_pages(urls: List[str], focus: Optional[str]) -> List[str]:
+    """Scrape and format several URLs concurrently, in order"""
+    selectors = _focus_selectors(focus)
+    semaphore = asyncio.Semaphore(SCRAPE_BATCH_CONCURRENCY)
+    
+    async def scrape(url: str) -> str:
+        async with semaphore:
+            return await _scrape_and_format(url, focus, selectors)
+    
+    pages = await asyncio.gather(*(scrape(url) for url in urls), return_exceptions=True)
+    return [
+        f"Scraping error: Error in scrape_website for '{url}': {str(page)}" if isinstance(page, Exception) else page
+        for url, page in zip(urls, pages)
+    ]
+
+@function_tool
+async def scrape_website(url: str, focus: Optional[str] = None) -> str:
+    """
+    Scrape content from a website.
+    
+    Args:
+        url: The URL to scrape
+        focus: Focus area (e.g., "about", "team", "investors")
+    """
+    _scrape_logger.info("Tool called: scrape_website(url='%s', focus='%s')", url, focus)
+    pages = await _scrape_pages([url], focus)
+    return pages[0]
+
+@function_tool
+async def batch_scrape_websites(urls: List[str], focus: Optional[str] = None) -> str:
+    """
+    Scrape several websites at once. Prefer this over repeated scrape_website calls when you need multiple pages.
+    
+    Args:
+        urls: The URLs to scrape
+        focus: Focus area applied to every page (e.g., "about", "team", "investors")
+    """
+    _scrape_logger.info("Tool called: batch_scrape_websites(%d urls, focus='%s')", len(urls), focus)
+    pages = await _scrape_pages(urls, focus)
+    return BATCH_SCRAPE_SEPARATOR.join(pages)